@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Crash-safe file writes for todu.
+
+Cache files, sync.json and other state are replaced via a temp file that is
+fsynced and renamed over the target, so readers never see truncated JSON.
+An advisory lock serializes read-modify-write cycles across processes.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking, writes are still atomic
+    fcntl = None
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> None:
+    """
+    Atomically replace a file's contents.
+
+    Writes to a temp file in the same directory, fsyncs it, then renames it
+    over the target. A killed process leaves either the old or the new file,
+    never a partial one.
+
+    Args:
+        path: File to write
+        data: Complete new contents
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, indent: int = 2) -> None:
+    """
+    Atomically write data as JSON.
+
+    Args:
+        path: File to write
+        data: JSON-serializable data
+        indent: JSON indentation (matches the cache's existing format)
+    """
+    atomic_write_bytes(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a file while the block runs.
+
+    The lock is taken on a sibling '<name>.lock' file so the target itself
+    can still be replaced atomically.
+
+    Args:
+        path: File whose read-modify-write cycle should be serialized
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(lock_path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
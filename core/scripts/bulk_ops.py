@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Bulk update support for the update-issue.py/update-task.py scripts.
+
+Builds a list of operations from a comma-separated ID list or a JSONL file,
+runs them with bounded concurrency over a caller-supplied client, and
+reports success or failure per item, so triaging many items costs one
+process and one client instead of one script run each.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_CONCURRENCY = 4
+
+
+def parse_ids(value: str) -> List[str]:
+    """
+    Split a comma-separated ID list such as '12,15,31'.
+
+    Args:
+        value: Comma-separated IDs
+
+    Returns:
+        Non-empty, stripped IDs in the given order
+    """
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def load_operations(
+    id_field: str,
+    ids: Optional[List[str]] = None,
+    ops_file: Optional[str] = None,
+    defaults: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the operations for a bulk run.
+
+    Each ID from ids becomes one operation carrying the defaults (the
+    update flags given on the command line). Each line of ops_file is a
+    JSON object naming its item in id_field plus its own changes, which
+    override the defaults.
+
+    Args:
+        id_field: Key that identifies the item (e.g. 'issue' or 'task_id')
+        ids: Item IDs to apply the defaults to
+        ops_file: Path to a JSONL file of operations
+        defaults: Changes applied to every operation
+
+    Returns:
+        Operation dicts in input order
+
+    Raises:
+        ValueError: If an ops file line is not a JSON object with id_field
+    """
+    defaults = {key: value for key, value in (defaults or {}).items() if value not in (None, False)}
+    operations = [{id_field: item_id, **defaults} for item_id in ids or []]
+
+    if ops_file:
+        with open(ops_file) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    operation = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{ops_file}:{line_number}: invalid JSON: {e}")
+                if not isinstance(operation, dict) or id_field not in operation:
+                    raise ValueError(f"{ops_file}:{line_number}: expected an object with '{id_field}'")
+                operations.append({**defaults, **operation})
+
+    return operations
+
+
+def run_operations(
+    operations: List[Dict[str, Any]],
+    apply: Callable[[Dict[str, Any]], Dict[str, Any]],
+    id_field: str,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    Apply every operation with at most concurrency running at once.
+
+    A failing operation is reported and doesn't stop the others.
+
+    Args:
+        operations: Operation dicts from load_operations()
+        apply: Performs one operation and returns its result (raises on failure)
+        id_field: Key that identifies the item in each operation
+        concurrency: Maximum number of operations in flight
+
+    Returns:
+        One report per operation, in input order, with 'success' and either
+        'result' or 'error'
+    """
+    def run(operation):
+        try:
+            return {id_field: operation[id_field], "success": True, "result": apply(operation)}
+        except Exception as e:
+            return {id_field: operation[id_field], "success": False, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(run, operations))
+
+
+def summarize(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Wrap per-item reports with success/failure counts.
+
+    Args:
+        reports: Reports from run_operations()
+
+    Returns:
+        Dict with 'results', 'succeeded' and 'failed'
+    """
+    failed = sum(1 for report in reports if not report["success"])
+    return {
+        "results": reports,
+        "succeeded": len(reports) - failed,
+        "failed": failed
+    }
@@ -10,6 +10,9 @@ import sys
 from pathlib import Path
 import glob
 
+sys.path.insert(0, str(Path(__file__).parent))
+import item_store
+
 CACHE_DIR = Path.home() / ".local" / "todu"
 PROJECTS_FILE = CACHE_DIR / "projects.json"
 ISSUES_DIR = CACHE_DIR / "issues"
@@ -39,37 +42,42 @@ def save_projects(projects):
         return False
 
 def cleanup_issue_files(system, repo=None, project_id=None):
-    """Delete issue files associated with a project."""
-    if not ISSUES_DIR.exists():
-        return 0
-
+    """Delete issue files and item store rows associated with a project."""
     deleted_count = 0
 
     try:
-        if system in ['github', 'forgejo'] and repo:
-            # For GitHub/Forgejo, match pattern: {system}-{owner}_{repo}-*.json
-            owner_repo = repo.replace('/', '_')
-            pattern = f"{system}-{owner_repo}-*.json"
-            matching_files = ISSUES_DIR.glob(pattern)
-
-            for file_path in matching_files:
-                file_path.unlink()
-                deleted_count += 1
-
-        elif system == 'todoist' and project_id:
-            # For Todoist, need to read each file and check project_id
-            todoist_files = ISSUES_DIR.glob("todoist-*.json")
-
-            for file_path in todoist_files:
-                try:
-                    with open(file_path) as f:
-                        data = json.load(f)
-                        if data.get('systemData', {}).get('project_id') == project_id:
-                            file_path.unlink()
-                            deleted_count += 1
-                except Exception:
-                    # Skip files that can't be read
-                    continue
+        keys = set()
+
+        if ISSUES_DIR.exists():
+            if system in ['github', 'forgejo'] and repo:
+                # For GitHub/Forgejo, match pattern: {system}-{owner}_{repo}-*.json
+                owner_repo = repo.replace('/', '_')
+                pattern = f"{system}-{owner_repo}-*.json"
+                keys.update(file_path.stem for file_path in ISSUES_DIR.glob(pattern))
+
+            elif system == 'todoist' and project_id:
+                # For Todoist, need to read each file and check project_id
+                for file_path in ISSUES_DIR.glob("todoist-*.json"):
+                    try:
+                        with open(file_path) as f:
+                            data = json.load(f)
+                            if data.get('systemData', {}).get('project_id') == project_id:
+                                keys.add(file_path.stem)
+                    except Exception:
+                        # Skip files that can't be read
+                        continue
+
+        # Remove the store rows along with the files so searches don't return
+        # them, including rows whose file an earlier delete already removed
+        with item_store.open_store() as conn:
+            if system in ['github', 'forgejo'] and repo:
+                keys.update(item_store.project_keys(conn, system, repo=repo))
+            elif system == 'todoist' and project_id:
+                keys.update(item_store.project_keys(conn, system, project_id=project_id))
+
+            for key in sorted(keys):
+                if item_store.delete_item(conn, key):
+                    deleted_count += 1
 
     except Exception as e:
         print(json.dumps({"warning": f"Error cleaning up issue files: {e}"}), file=sys.stderr)
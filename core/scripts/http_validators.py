@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+HTTP cache validators for conditional sync requests.
+
+Stores the ETag and Last-Modified headers returned for each API request
+(keyed by URL and query parameters) in ~/.local/todu/validators.json, so the
+next sync can send If-None-Match / If-Modified-Since and skip unchanged
+responses on a 304 Not Modified. Parameters that change on every sync (such
+as the `since` cursor) are left out of the key, so each page keeps one entry
+that later syncs replace.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from atomic_io import atomic_write_json, file_lock
+
+
+# Validator file location
+VALIDATORS_FILE = Path.home() / ".local" / "todu" / "validators.json"
+
+
+def validator_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Build the lookup key for a request.
+
+    Args:
+        url: Request URL without query string
+        params: Query parameters
+
+    Returns:
+        URL with its parameters in a stable order
+    """
+    if not params:
+        return url
+    query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+    return f"{url}?{query}"
+
+
+def load_validators() -> Dict[str, Dict[str, Any]]:
+    """
+    Read all stored validators.
+
+    Returns:
+        Mapping of validator key to stored entry. Empty if the file is
+        missing or unreadable.
+    """
+    if not VALIDATORS_FILE.exists():
+        return {}
+
+    try:
+        with open(VALIDATORS_FILE, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def save_validators(entries: Dict[str, Dict[str, Any]], replace: Optional[str] = None) -> None:
+    """
+    Merge validator entries into the stored file.
+
+    Callers should only save validators for responses whose content has been
+    written to the cache; otherwise a later 304 would skip data that was
+    never stored.
+
+    Args:
+        entries: Mapping of validator key to entry from response_validators()
+        replace: URL whose stored entries are dropped first, so a complete
+            listing's pages replace the previous listing's (including pages
+            it no longer has)
+    """
+    if not entries and not replace:
+        return
+
+    # Lock the read-modify-write so parallel syncs keep each other's entries
+    with file_lock(VALIDATORS_FILE):
+        validators = load_validators()
+        if replace:
+            validators = {
+                key: entry for key, entry in validators.items()
+                if key != replace and not key.startswith(f"{replace}?")
+            }
+        validators.update(entries)
+        atomic_write_json(VALIDATORS_FILE, validators)
+
+
+def conditional_headers(entry: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+    """
+    Build conditional request headers from a stored entry.
+
+    Args:
+        entry: Stored validator entry, or None
+
+    Returns:
+        If-None-Match / If-Modified-Since headers (empty if nothing stored)
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+    return headers
+
+
+def response_validators(headers: Mapping[str, str], **extra: Any) -> Optional[Dict[str, Any]]:
+    """
+    Extract validators from response headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        **extra: Additional values to keep with the entry (e.g. item counts
+            needed when a later response is a bodiless 304)
+
+    Returns:
+        Entry dict, or None if the response carried no validators
+    """
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return None
+
+    entry: Dict[str, Any] = {}
+    if etag:
+        entry['etag'] = etag
+    if last_modified:
+        entry['lastModified'] = last_modified
+    entry.update(extra)
+    return entry
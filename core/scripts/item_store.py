@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed item store for todu.
+
+Mirrors the normalized items written to ~/.local/todu/issues/ into a single
+database with indexed columns, so queries can filter and sort in SQL instead
+of parsing every cached JSON file.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import journal
+from atomic_io import atomic_write_json
+
+
+# Store locations
+TODU_DIR = Path.home() / ".local" / "todu"
+ITEMS_DIR = TODU_DIR / "issues"
+STORE_FILE = TODU_DIR / "items.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    system TEXT,
+    state TEXT,
+    status TEXT,
+    repo TEXT,
+    project_id TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    due_date TEXT,
+    content_hash TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_system ON items(system);
+CREATE INDEX IF NOT EXISTS idx_items_state ON items(state);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items(status);
+CREATE INDEX IF NOT EXISTS idx_items_repo ON items(repo);
+CREATE INDEX IF NOT EXISTS idx_items_project_id ON items(project_id);
+CREATE INDEX IF NOT EXISTS idx_items_updated_at ON items(updated_at);
+CREATE INDEX IF NOT EXISTS idx_items_due_date ON items(due_date);
+
+-- Inverted indexes: label/assignee -> item keys
+CREATE TABLE IF NOT EXISTS item_labels (
+    label TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (label, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_item_labels_key ON item_labels(key);
+CREATE TABLE IF NOT EXISTS item_assignees (
+    assignee TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (assignee, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_item_assignees_key ON item_assignees(key);
+
+-- Store-wide flags, e.g. whether the pre-store JSON cache was imported
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Full-text index over title and description. FTS5 can only look rows up
+-- by rowid, so item_fts_rows maps each item key to its items_fts rowid
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title,
+    description,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS item_fts_rows (
+    fts_rowid INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+"""
+
+# Bumped whenever a schema change needs existing rows to be re-indexed
+SCHEMA_VERSION = 5
+
+# bm25() column weights for items_fts (title, description)
+FTS_WEIGHTS = (10.0, 1.0)
+
+
+class StoreConnection(sqlite3.Connection):
+    """
+    SQLite connection that journals the changes made through it on commit.
+
+    write_item() and delete_item() queue their change events in
+    pending_events; commit() appends the batch to the journal in one write.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pending_events: List[Dict[str, Any]] = []
+
+    def commit(self) -> None:
+        super().commit()
+        if self.pending_events:
+            events, self.pending_events = self.pending_events, []
+            journal.append_events(events)
+
+
+def connect() -> sqlite3.Connection:
+    """
+    Open the item store, creating the database and schema if needed.
+
+    Returns:
+        SQLite connection with WAL enabled so concurrent syncs can write
+        while searches read.
+    """
+    STORE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(STORE_FILE), timeout=30, factory=StoreConnection)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(items)")}
+        if 'content_hash' not in columns:
+            conn.execute("ALTER TABLE items ADD COLUMN content_hash TEXT")
+        # Before version 5 items_fts had an unindexed key column, so every
+        # per-item delete scanned the whole table
+        if 'key' in {row[1] for row in conn.execute("PRAGMA table_info(items_fts)")}:
+            conn.execute("DROP TABLE items_fts")
+            conn.executescript(SCHEMA)
+        _reindex(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+
+    return conn
+
+
+def _reindex(conn: sqlite3.Connection) -> None:
+    """Rebuild content hashes and the label, assignee and full-text indexes from stored item data."""
+    conn.execute("DELETE FROM item_labels")
+    conn.execute("DELETE FROM item_assignees")
+    conn.execute("DELETE FROM items_fts")
+    conn.execute("DELETE FROM item_fts_rows")
+    for key, data in conn.execute("SELECT key, data FROM items").fetchall():
+        item = json.loads(data)
+        conn.execute("UPDATE items SET content_hash = ? WHERE key = ?", (content_hash(item), key))
+        _index_item(conn, key, item)
+
+
+def _index_item(conn: sqlite3.Connection, key: str, item: Dict[str, Any]) -> None:
+    """Replace the label, assignee and full-text index entries for one item."""
+    conn.execute("DELETE FROM item_labels WHERE key = ?", (key,))
+    conn.execute("DELETE FROM item_assignees WHERE key = ?", (key,))
+
+    # Replace the full-text row in place, keeping its rowid
+    row = conn.execute("SELECT fts_rowid FROM item_fts_rows WHERE key = ?", (key,)).fetchone()
+    if row:
+        conn.execute("DELETE FROM items_fts WHERE rowid = ?", (row[0],))
+    cursor = conn.execute(
+        "INSERT INTO items_fts (rowid, title, description) VALUES (?, ?, ?)",
+        (row[0] if row else None, item.get('title') or "", item.get('description') or "")
+    )
+    if not row:
+        conn.execute("INSERT INTO item_fts_rows (key, fts_rowid) VALUES (?, ?)", (key, cursor.lastrowid))
+    conn.executemany(
+        "INSERT OR IGNORE INTO item_labels (label, key) VALUES (?, ?)",
+        [(label, key) for label in item.get('labels') or []]
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO item_assignees (assignee, key) VALUES (?, ?)",
+        [(assignee, key) for assignee in item.get('assignees') or []]
+    )
+
+
+@contextmanager
+def open_store() -> Iterator[sqlite3.Connection]:
+    """
+    Context manager around connect() that commits and closes.
+
+    Changes are committed even if the block raises: every write_item() has
+    already written its JSON file, so the store must keep the matching rows.
+
+    Yields:
+        SQLite connection to the item store
+    """
+    conn = connect()
+    try:
+        yield conn
+    finally:
+        conn.commit()
+        conn.close()
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a normalized item.
+
+    The key matches the JSON filename stem used in ~/.local/todu/issues/,
+    e.g. 'github-owner_repo-42' or 'todoist-123456'.
+
+    Args:
+        item: Normalized item dict
+
+    Returns:
+        Cache key string
+    """
+    system = item.get('system', 'unknown')
+    repo = item.get('systemData', {}).get('repo')
+    if system in ['github', 'forgejo'] and repo:
+        return f"{system}-{repo.replace('/', '_')}-{item.get('id')}"
+    return f"{system}-{item.get('id')}"
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """
+    Hash a normalized item's content independent of key order.
+
+    Args:
+        item: Normalized item dict
+
+    Returns:
+        Hex SHA-256 digest of the item's canonical JSON
+    """
+    canonical = json.dumps(item, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def upsert_item(conn: sqlite3.Connection, item: Dict[str, Any]) -> bool:
+    """
+    Insert or replace a normalized item in the store.
+
+    Args:
+        conn: Open store connection
+        item: Normalized item dict
+
+    Returns:
+        True if the item was not in the store before
+    """
+    key = item_key(item)
+    system_data = item.get('systemData', {})
+    is_new = conn.execute("SELECT 1 FROM items WHERE key = ?", (key,)).fetchone() is None
+
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO items
+            (key, system, state, status, repo, project_id, created_at, updated_at, due_date, content_hash, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            key,
+            item.get('system'),
+            item.get('state'),
+            item.get('status'),
+            system_data.get('repo'),
+            system_data.get('project_id'),
+            item.get('createdAt'),
+            # Sort column: updatedAt with fallback to createdAt, as list-items sorts
+            item.get('updatedAt') or item.get('createdAt') or '',
+            item.get('dueDate'),
+            content_hash(item),
+            json.dumps(item)
+        )
+    )
+    _index_item(conn, key, item)
+    return is_new
+
+
+def write_item(conn: sqlite3.Connection, item: Dict[str, Any]) -> str:
+    """
+    Write a normalized item to the JSON cache and the item store if it changed.
+
+    The item's content hash is compared with the stored one; when they match
+    and the cache file exists, nothing is written. Otherwise the change is
+    queued for the change journal, which receives it on the next commit.
+
+    Args:
+        conn: Open store connection
+        item: Normalized item dict
+
+    Returns:
+        'new', 'updated' or 'unchanged'
+    """
+    key = item_key(item)
+    item_file = ITEMS_DIR / f"{key}.json"
+
+    row = conn.execute("SELECT content_hash, data FROM items WHERE key = ?", (key,)).fetchone()
+    if row and row[0] == content_hash(item) and item_file.exists():
+        return 'unchanged'
+
+    is_new = not item_file.exists()
+    old = None
+    if row:
+        old = json.loads(row[1])
+    elif not is_new:
+        try:
+            with open(item_file) as f:
+                old = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+
+    # Temp file + fsync + rename: a killed sync never leaves truncated JSON
+    atomic_write_json(item_file, item)
+
+    upsert_item(conn, item)
+
+    outcome = 'new' if is_new else 'updated'
+    conn.pending_events.append(journal.build_event(key, outcome, old, item))
+    return outcome
+
+
+def delete_item(conn: sqlite3.Connection, key: str) -> bool:
+    """
+    Remove an item from the JSON cache and the item store, journaling the deletion.
+
+    Args:
+        conn: Open store connection
+        key: Cache key from item_key()
+
+    Returns:
+        True if the item was cached before
+    """
+    item_file = ITEMS_DIR / f"{key}.json"
+    existed = item_file.exists()
+    if existed:
+        item_file.unlink()
+
+    row = conn.execute("SELECT data FROM items WHERE key = ?", (key,)).fetchone()
+    conn.execute("DELETE FROM items WHERE key = ?", (key,))
+    conn.execute("DELETE FROM item_labels WHERE key = ?", (key,))
+    conn.execute("DELETE FROM item_assignees WHERE key = ?", (key,))
+    fts_row = conn.execute("SELECT fts_rowid FROM item_fts_rows WHERE key = ?", (key,)).fetchone()
+    if fts_row:
+        conn.execute("DELETE FROM items_fts WHERE rowid = ?", (fts_row[0],))
+        conn.execute("DELETE FROM item_fts_rows WHERE key = ?", (key,))
+
+    if not (existed or row):
+        return False
+
+    conn.pending_events.append(journal.build_event(key, 'deleted', json.loads(row[0]) if row else None, None))
+    return True
+
+
+def import_items(conn: sqlite3.Connection, items: Iterable[Dict[str, Any]]) -> int:
+    """
+    Load already-parsed items into the store (e.g. to backfill from JSON files).
+
+    Args:
+        conn: Open store connection
+        items: Normalized item dicts
+
+    Returns:
+        Number of items imported
+    """
+    count = 0
+    for item in items:
+        upsert_item(conn, item)
+        count += 1
+    return count
+
+
+def get_item(conn: sqlite3.Connection, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up one cached item by key.
+
+    Args:
+        conn: Open store connection
+        key: Cache key from item_key()
+
+    Returns:
+        Normalized item dict, or None if it is not cached
+    """
+    row = conn.execute("SELECT data FROM items WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def project_keys(conn: sqlite3.Connection, system: str, repo: Optional[str] = None,
+                 project_id: Optional[str] = None) -> List[str]:
+    """
+    List the keys of stored items belonging to a repo (GitHub/Forgejo) or Todoist project.
+
+    Args:
+        conn: Open store connection
+        system: 'github', 'forgejo' or 'todoist'
+        repo: Repository in "owner/repo" format
+        project_id: Todoist project ID
+
+    Returns:
+        Cache keys
+    """
+    if repo:
+        rows = conn.execute("SELECT key FROM items WHERE system = ? AND repo = ?", (system, repo))
+    elif project_id:
+        rows = conn.execute("SELECT key FROM items WHERE system = ? AND project_id = ?", (system, project_id))
+    else:
+        return []
+    return [row[0] for row in rows]
+
+
+def is_backfilled(conn: sqlite3.Connection) -> bool:
+    """Whether JSON files cached before the store existed have been imported."""
+    return conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled'").fetchone() is not None
+
+
+def mark_backfilled(conn: sqlite3.Connection) -> None:
+    """Record that the one-time import of pre-store JSON files is done."""
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled', '1')")
+
+
+def count_items(conn: sqlite3.Connection) -> int:
+    """Return the number of items in the store."""
+    return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+
+def query_items(
+    conn: sqlite3.Connection,
+    system: Optional[str] = None,
+    state: Optional[str] = None,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    labels: Optional[List[str]] = None,
+    project_id: Optional[str] = None,
+    query: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Query items with filters, newest first (or best match first for text queries).
+
+    Args:
+        conn: Open store connection
+        system: Filter by system
+        state: Filter by system-level state
+        status: Filter by workflow status
+        assignee: Filter by assignee username
+        labels: Match items having any of these labels
+        project_id: Filter by project ID (Todoist)
+        query: Free-text search over title and description
+        limit: Maximum number of items to return
+        offset: Number of matching items to skip
+
+    Yields:
+        Normalized item dicts sorted by BM25 relevance when a query is given,
+        otherwise by updatedAt (fallback createdAt), descending
+    """
+    clauses = []
+    params: List[Any] = []
+
+    match = fts_match_expression(query) if query else None
+    if query and not match:
+        return
+
+    for column, value in [
+        ('system', system),
+        ('state', state),
+        ('status', status),
+        ('project_id', project_id),
+    ]:
+        if value:
+            clauses.append(f"items.{column} = ?")
+            params.append(value)
+
+    # Label and assignee filters are lookups in the inverted indexes
+    if assignee:
+        clauses.append("items.key IN (SELECT key FROM item_assignees WHERE assignee = ?)")
+        params.append(assignee)
+
+    if labels:
+        placeholders = ", ".join("?" for _ in labels)
+        clauses.append(f"items.key IN (SELECT key FROM item_labels WHERE label IN ({placeholders}))")
+        params.extend(labels)
+
+    if match:
+        # CROSS JOIN keeps the full-text match as the outer loop; otherwise
+        # SQLite may scan item_fts_rows and run the match once per row
+        sql = (
+            "SELECT items.data FROM items_fts"
+            " CROSS JOIN item_fts_rows ON item_fts_rows.fts_rowid = items_fts.rowid"
+            " CROSS JOIN items ON items.key = item_fts_rows.key"
+        )
+        clauses.insert(0, "items_fts MATCH ?")
+        params.insert(0, match)
+        order = f"bm25(items_fts, {', '.join(str(w) for w in FTS_WEIGHTS)}), items.updated_at DESC"
+    else:
+        sql = "SELECT items.data FROM items"
+        order = "items.updated_at DESC"
+
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order}"
+
+    # ORDER BY + LIMIT lets SQLite keep only the top rows (or walk the
+    # updated_at index) instead of sorting every match
+    if limit is not None or offset:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+
+    for (data,) in conn.execute(sql, params):
+        yield json.loads(data)
+
+
+def fts_match_expression(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Each word becomes a quoted term and terms are OR-ed, so BM25 ranks items
+    matching more (and rarer) words first instead of requiring every word.
+
+    Args:
+        query: Free-text search string
+
+    Returns:
+        MATCH expression, or None if the query has no searchable words
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in terms)
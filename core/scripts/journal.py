@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Append-only change journal for the todu cache.
+
+Every item written or deleted through item_store adds a compact change
+event (key, changed fields, old/new status, timestamp, sequence number) to
+~/.local/todu/journal/journal.jsonl; a connection's events are appended
+together when it commits. Consumers remember the last sequence
+number they saw and read only newer events instead of rescanning the cache.
+The active file is rotated into numbered segments once it grows too large,
+and the oldest segments are dropped.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from atomic_io import file_lock
+
+
+# Journal locations
+JOURNAL_DIR = Path.home() / ".local" / "todu" / "journal"
+JOURNAL_FILE = JOURNAL_DIR / "journal.jsonl"
+
+# Rotation policy
+MAX_FILE_BYTES = 5 * 1024 * 1024
+MAX_SEGMENTS = 10
+
+
+def changed_fields(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    List the top-level fields that differ between two versions of an item.
+
+    systemData is compared per key and reported as 'systemData.<key>'.
+
+    Args:
+        old: Previous normalized item, or None if it was not cached
+        new: New normalized item, or None if it was deleted
+
+    Returns:
+        Sorted field names
+    """
+    old = old or {}
+    new = new or {}
+    fields = set()
+
+    for field in set(old) | set(new):
+        if field == 'systemData':
+            old_data = old.get(field) or {}
+            new_data = new.get(field) or {}
+            fields.update(
+                f"systemData.{key}" for key in set(old_data) | set(new_data)
+                if old_data.get(key) != new_data.get(key)
+            )
+        elif old.get(field) != new.get(field):
+            fields.add(field)
+
+    return sorted(fields)
+
+
+def _segment_path(first_seq: int) -> Path:
+    """Path of a rotated segment, named by its first sequence number so segments sort in order."""
+    return JOURNAL_DIR / f"journal-{first_seq:012d}.jsonl"
+
+
+def _segments() -> List[Path]:
+    """Rotated segments, oldest first."""
+    return sorted(JOURNAL_DIR.glob("journal-*.jsonl"))
+
+
+def _parse_seq(line: bytes) -> Optional[int]:
+    """Sequence number of one journal line, or None if it is incomplete or corrupt."""
+    try:
+        return json.loads(line)["seq"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _head_seq(path: Path) -> Optional[int]:
+    """Sequence number of the first event in a journal file, or None if it has none."""
+    try:
+        with open(path, 'rb') as f:
+            for line in f:
+                seq = _parse_seq(line)
+                if seq is not None:
+                    return seq
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def _tail_seq(path: Path) -> Optional[int]:
+    """
+    Sequence number of the last complete event in a journal file, or None.
+
+    Reads backwards from the end in growing blocks, so only the tail of a
+    large file is read. A line cut short by a crash is skipped.
+    """
+    try:
+        with open(path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            block = 4096
+            while True:
+                start = max(0, end - block)
+                f.seek(start)
+                lines = f.read(end - start).splitlines()
+                # The block's first line may start mid-line unless it is the file's start
+                for line in reversed(lines if start == 0 else lines[1:]):
+                    seq = _parse_seq(line)
+                    if seq is not None:
+                        return seq
+                if start == 0:
+                    return None
+                block *= 2
+    except FileNotFoundError:
+        return None
+
+
+def _last_seq() -> int:
+    """Sequence number of the newest event, from the active file or else the newest segment."""
+    seq = _tail_seq(JOURNAL_FILE)
+    if seq is None:
+        segments = _segments()
+        if segments:
+            seq = _tail_seq(segments[-1])
+    return seq or 0
+
+
+def _rotate() -> None:
+    """Move the active file into a segment and drop segments beyond MAX_SEGMENTS."""
+    first = _head_seq(JOURNAL_FILE)
+    if first is None:
+        return
+    os.replace(JOURNAL_FILE, _segment_path(first))
+
+    for segment in _segments()[:-MAX_SEGMENTS]:
+        segment.unlink()
+
+
+def build_event(key: str, change: str, old: Optional[Dict[str, Any]] = None,
+                new: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Describe one cache change, ready for append_events().
+
+    Args:
+        key: Cache key from item_store.item_key()
+        change: 'new', 'updated' or 'deleted'
+        old: Previous normalized item, if it was cached
+        new: New normalized item, unless it was deleted
+
+    Returns:
+        Event dict without a sequence number
+    """
+    return {
+        "key": key,
+        "change": change,
+        # Only updates list fields; a new or deleted item changes all of them
+        "fields": changed_fields(old, new) if old and new else [],
+        "oldStatus": (old or {}).get('status'),
+        "newStatus": (new or {}).get('status'),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def append_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Append a batch of events to the journal with one write and one fsync.
+
+    Sequence numbers continue from the last event in the journal files
+    themselves, so there is no separate counter to lose or get out of step.
+
+    Args:
+        events: Events from build_event()
+
+    Returns:
+        The events as written, including their sequence numbers
+    """
+    if not events:
+        return []
+
+    JOURNAL_DIR.mkdir(parents=True, exist_ok=True)
+
+    with file_lock(JOURNAL_FILE):
+        seq = _last_seq()
+        written = []
+        for event in events:
+            seq += 1
+            written.append({"seq": seq, **event})
+
+        data = ''.join(json.dumps(event, separators=(',', ':')) + '\n' for event in written)
+
+        with open(JOURNAL_FILE, 'ab') as f:
+            # Terminate a line cut short by a crash so it doesn't swallow the next event
+            if f.tell() > 0:
+                with open(JOURNAL_FILE, 'rb') as tail:
+                    tail.seek(-1, os.SEEK_END)
+                    if tail.read(1) != b'\n':
+                        data = '\n' + data
+            f.write(data.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+
+        if JOURNAL_FILE.stat().st_size >= MAX_FILE_BYTES:
+            _rotate()
+
+    return written
+
+
+def last_seq() -> int:
+    """Return the sequence number of the newest event (0 if none)."""
+    if not JOURNAL_DIR.exists():
+        return 0
+    with file_lock(JOURNAL_FILE):
+        return _last_seq()
+
+
+def first_seq() -> int:
+    """Return the sequence number of the oldest retained event."""
+    if not JOURNAL_DIR.exists():
+        return 1
+    with file_lock(JOURNAL_FILE):
+        segments = _segments()
+        if segments:
+            return int(segments[0].stem.split('-')[1])
+        seq = _head_seq(JOURNAL_FILE)
+        return seq if seq is not None else _last_seq() + 1
+
+
+def read_events(since: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield events with a sequence number greater than since, oldest first.
+
+    Segments that end before since are skipped without being read.
+
+    Args:
+        since: Last sequence number the consumer has already seen
+        limit: Maximum number of events to yield
+
+    Yields:
+        Event dicts
+    """
+    if not JOURNAL_DIR.exists():
+        return
+
+    # Hold the lock so a rotation can't move events between the listing and the read
+    with file_lock(JOURNAL_FILE):
+        segments = _segments()
+        starts = [int(path.stem.split('-')[1]) for path in segments]
+        files = [
+            path for index, path in enumerate(segments)
+            if index + 1 == len(segments) or starts[index + 1] > since + 1
+        ]
+        if JOURNAL_FILE.exists():
+            files.append(JOURNAL_FILE)
+
+        count = 0
+        for path in files:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if event.get("seq", 0) <= since:
+                        continue
+                    yield event
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
@@ -0,0 +1,69 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = []
+# requires-python = ">=3.9"
+# ///
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import journal
+
+def list_changes(since=0, limit=None, key=None, output_format='json'):
+    """Print journal events newer than since, oldest first."""
+    events = list(journal.read_events(since, limit))
+
+    # Where the next call should resume, whether or not --key filtered events out
+    next_since = events[-1]['seq'] if events else since
+    if key:
+        events = [event for event in events if event['key'] == key]
+
+    # Events after since were rotated away; the consumer must rescan the cache
+    truncated = since + 1 < journal.first_seq()
+
+    if output_format == 'json':
+        print(json.dumps({
+            "events": events,
+            "count": len(events),
+            "lastSeq": next_since,
+            "truncated": truncated
+        }, indent=2))
+        return 0
+
+    if truncated:
+        print(f"Note: events after #{since} were rotated out of the journal; rescan the cache.\n")
+    if not events:
+        print("No changes.")
+        return 0
+
+    for event in events:
+        status = ""
+        if event.get('oldStatus') != event.get('newStatus'):
+            status = f" ({event.get('oldStatus') or '-'} -> {event.get('newStatus') or '-'})"
+        fields = f": {', '.join(event['fields'])}" if event['change'] == 'updated' and event['fields'] else ""
+        print(f"#{event['seq']} {event['timestamp']} {event['change']} {event['key']}{status}{fields}")
+
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='List cache changes recorded in the change journal')
+    parser.add_argument('--since', type=int, default=0,
+                        help='Only show events after this sequence number (the lastSeq of a previous call)')
+    parser.add_argument('--limit', type=int, help='Maximum number of events to return')
+    parser.add_argument('--key', help='Only show events for this item key (e.g., github-owner_repo-42)')
+    parser.add_argument('--format', choices=['json', 'markdown'], default='json', help='Output format')
+
+    args = parser.parse_args()
+
+    if args.since < 0:
+        parser.error("--since must not be negative")
+    if args.limit is not None and args.limit < 1:
+        parser.error("--limit must be at least 1")
+
+    return list_changes(args.since, args.limit, args.key, args.format)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,13 +6,22 @@
 
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+# Shared item store lives alongside this script
+sys.path.insert(0, str(Path(__file__).parent))
+import item_store
+
 CACHE_DIR = Path.home() / ".local" / "todu"
 PROJECTS_FILE = CACHE_DIR / "projects.json"
 
+# Below this many files, parsing serially beats starting a thread pool
+PARALLEL_LOAD_THRESHOLD = 64
+
 def load_projects():
     """Load project registry from projects.json"""
     if not PROJECTS_FILE.exists():
@@ -32,29 +41,53 @@ def resolve_project_nickname(project_id, system, projects):
             return nickname
     return None
 
+def read_json_file(path):
+    """Read and decode one JSON file, returning (item, error)"""
+    try:
+        with open(path, 'rb') as f:
+            return json.loads(f.read()), None
+    except Exception as e:
+        return None, e
+
+def load_json_files(paths):
+    """Read and decode JSON files, spreading the work over a thread pool.
+
+    Returns (path, item, error) tuples in the same order as paths, so callers
+    report failures deterministically regardless of completion order.
+    """
+    paths = list(paths)
+    if len(paths) < PARALLEL_LOAD_THRESHOLD:
+        results = [read_json_file(path) for path in paths]
+    else:
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            results = list(executor.map(read_json_file, paths))
+
+    return [(path, item, error) for path, (item, error) in zip(paths, results)]
+
 def load_items_from_consolidated():
     """Load items from new consolidated structure: ~/.local/todu/issues/"""
     items_dir = CACHE_DIR / "issues"
     items = []
 
-    if items_dir.exists():
-        for item_file in items_dir.glob("*.json"):
-            try:
-                with open(item_file) as f:
-                    item = json.load(f)
-                    items.append(item)
-            except Exception as e:
-                print(f"Warning: Failed to load {item_file}: {e}", file=sys.stderr)
-                continue
+    if not items_dir.exists():
+        return items
+
+    paths = sorted(items_dir.glob("*.json"))
+
+    for path, item, error in load_json_files(paths):
+        if error is not None:
+            print(f"Warning: Failed to load {path}: {error}", file=sys.stderr)
+            continue
+        items.append(item)
 
     return items
 
 def load_items_from_legacy():
     """Load items from legacy structure: ~/.local/todu/{system}/issues|tasks/"""
-    items = []
+    paths = []
 
     # Check for plugin directories
-    for system_dir in CACHE_DIR.iterdir():
+    for system_dir in sorted(CACHE_DIR.iterdir()):
         if not system_dir.is_dir() or system_dir.name == 'issues':
             continue
 
@@ -62,51 +95,66 @@ def load_items_from_legacy():
         for subdir_name in ['issues', 'tasks']:
             subdir = system_dir / subdir_name
             if subdir.exists():
-                for item_file in subdir.glob("*.json"):
-                    try:
-                        with open(item_file) as f:
-                            item = json.load(f)
-                            items.append(item)
-                    except Exception as e:
-                        print(f"Warning: Failed to load {item_file}: {e}", file=sys.stderr)
-                        continue
+                paths.extend(sorted(subdir.glob("*.json")))
 
-    return items
-
-def list_items(system=None, state=None, status=None, assignee=None, labels=None, project_id=None, output_format='json'):
-    """List items from local cache with optional filtering."""
-
-    # Try consolidated structure first, fall back to legacy
-    items = load_items_from_consolidated()
-    if not items:
-        items = load_items_from_legacy()
-
-    if not items:
-        print(json.dumps({"error": "No cached items found. Run sync first."}), file=sys.stderr)
-        return 1
-
-    # Apply filters
-    if system:
-        items = [i for i in items if i.get('system') == system]
+    items = []
+    for path, item, error in load_json_files(paths):
+        if error is not None:
+            print(f"Warning: Failed to load {path}: {error}", file=sys.stderr)
+            continue
+        items.append(item)
 
-    if state:
-        items = [i for i in items if i.get('state') == state]
+    return items
 
-    if status:
-        items = [i for i in items if i.get('status') == status]
+def backfill_store(conn):
+    """Import JSON files cached before the item store existed, once per store.
 
-    if assignee:
-        items = [i for i in items if assignee in i.get('assignees', [])]
+    Tracked with a store flag rather than the row count: a sync may already
+    have written items before the first search.
+    """
+    if item_store.is_backfilled(conn):
+        return
 
-    if labels:
-        label_list = labels.split(',')
-        items = [i for i in items if any(l in i.get('labels', []) for l in label_list)]
+    # Try consolidated structure first, fall back to legacy
+    cached = load_items_from_consolidated()
+    if not cached:
+        cached = load_items_from_legacy()
+    item_store.import_items(conn, cached)
+    item_store.mark_backfilled(conn)
 
-    if project_id:
-        items = [i for i in items if i.get('systemData', {}).get('project_id') == project_id]
+def list_items(system=None, state=None, status=None, assignee=None, labels=None, project_id=None, query=None, limit=None, offset=0, output_format='json'):
+    """List items from local cache with optional filtering."""
 
-    # Sort by updated date (newest first), with fallback to created date
-    items.sort(key=lambda x: x.get('updatedAt') or x.get('createdAt', ''), reverse=True)
+    label_list = labels.split(',') if labels else None
+
+    with item_store.open_store() as conn:
+        backfill_store(conn)
+
+        if item_store.count_items(conn) == 0:
+            print(json.dumps({"error": "No cached items found. Run sync first."}), file=sys.stderr)
+            return 1
+
+        # Filters and sort (newest updatedAt first, or relevance for --query) run in SQL
+        items = item_store.query_items(
+            conn,
+            system=system,
+            state=state,
+            status=status,
+            assignee=assignee,
+            labels=label_list,
+            project_id=project_id,
+            query=query,
+            limit=limit,
+            offset=offset
+        )
+
+        # Stream one item per line straight from the query cursor
+        if output_format == 'ndjson':
+            for item in items:
+                sys.stdout.write(json.dumps(item) + "\n")
+            return 0
+
+        items = list(items)
 
     # Format output
     if output_format == 'json':
@@ -156,10 +204,19 @@ def main():
     parser.add_argument('--assignee', help='Filter by assignee username')
     parser.add_argument('--labels', help='Comma-separated list of labels to filter by')
     parser.add_argument('--project-id', help='Filter by project ID (Todoist)')
-    parser.add_argument('--format', choices=['json', 'markdown'], default='json', help='Output format')
+    parser.add_argument('--query', help='Full-text search over titles and descriptions (results ranked by relevance)')
+    parser.add_argument('--limit', type=int, help='Return at most this many items (most recently updated first)')
+    parser.add_argument('--offset', type=int, default=0, help='Skip this many matching items (use with --limit to page)')
+    parser.add_argument('--format', choices=['json', 'markdown', 'ndjson'], default='json',
+                        help='Output format (ndjson streams one JSON item per line)')
 
     args = parser.parse_args()
 
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit must be zero or greater")
+    if args.offset < 0:
+        parser.error("--offset must be zero or greater")
+
     return list_items(
         system=args.system,
         state=args.state,
@@ -167,6 +224,9 @@ def main():
         assignee=args.assignee,
         labels=args.labels,
         project_id=args.project_id,
+        query=args.query,
+        limit=args.limit,
+        offset=args.offset,
         output_format=args.format
     )
 
@@ -37,7 +37,7 @@ def save_projects(projects):
         print(json.dumps({"error": f"Failed to save projects.json: {e}"}), file=sys.stderr)
         return False
 
-def register_project(nickname, system, repo=None, project_id=None):
+def register_project(nickname, system, repo=None, project_id=None, base_url=None):
     """Register a project with a nickname."""
 
     # Validate system
@@ -79,6 +79,12 @@ def register_project(nickname, system, repo=None, project_id=None):
     elif repo:
         project_data["repo"] = repo
 
+    # Forgejo base URL lets syncs run outside the repo's git checkout
+    if system == 'forgejo' and base_url:
+        project_data["baseUrl"] = base_url.rstrip('/')
+    elif system == 'forgejo' and projects.get(nickname, {}).get("baseUrl"):
+        project_data["baseUrl"] = projects[nickname]["baseUrl"]
+
     # Update projects
     projects[nickname] = project_data
 
@@ -104,10 +110,11 @@ def main():
                         help='System type')
     parser.add_argument('--repo', help='Repository in owner/name format (for GitHub/Forgejo)')
     parser.add_argument('--project-id', help='Project ID (for Todoist)')
+    parser.add_argument('--base-url', help='Forgejo base URL (e.g., https://forgejo.example.com), used by sync-all')
 
     args = parser.parse_args()
 
-    return register_project(args.nickname, args.system, args.repo, args.project_id)
+    return register_project(args.nickname, args.system, args.repo, args.project_id, args.base_url)
 
 if __name__ == '__main__':
     sys.exit(main())
@@ -12,23 +12,24 @@ from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
 
-# Import cache loading functions from list-items.py
+# Shared item store lives alongside this script
+sys.path.insert(0, str(Path(__file__).parent))
+import item_store
+
+# Import the store backfill from list-items.py
 _list_items_path = Path(__file__).parent / "list-items.py"
 _spec = importlib.util.spec_from_file_location("list_items", _list_items_path)
 _list_items = importlib.util.module_from_spec(_spec)
 _spec.loader.exec_module(_list_items)
 
-load_items_from_consolidated = _list_items.load_items_from_consolidated
-load_items_from_legacy = _list_items.load_items_from_legacy
+backfill_store = _list_items.backfill_store
 
 
 def load_all_tasks() -> List[Dict[str, Any]]:
-    """Load all tasks/issues from consolidated cache with legacy fallback."""
-    # Try consolidated structure first, fall back to legacy
-    tasks = load_items_from_consolidated()
-    if not tasks:
-        tasks = load_items_from_legacy()
-    return tasks
+    """Load all tasks/issues from the item store, importing older JSON caches first."""
+    with item_store.open_store() as conn:
+        backfill_store(conn)
+        return list(item_store.query_items(conn))
 
 
 def parse_priority(task: Dict[str, Any]) -> str:
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Retry and backoff for API calls made by the sync scripts.
+
+Transient failures (connection errors, 429, 5xx, and primary or secondary
+rate limits) are retried with jittered exponential backoff, waiting for the
+server's Retry-After or X-RateLimit-Reset when it says how long to back off.
+Works with any requests-style response object, so core needs no HTTP
+dependency.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+
+# Retry policy defaults
+DEFAULT_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 1.0   # seconds, doubled per attempt
+DEFAULT_MAX_DELAY = 60.0   # cap for computed backoff
+DEFAULT_MAX_WAIT = 900.0   # longest server-requested wait we'll sleep through
+
+# Statuses worth retrying; server errors only for requests that are safe to repeat
+RATE_LIMIT_STATUSES = {429}
+SERVER_ERROR_STATUSES = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+def server_delay(response: Any) -> Optional[float]:
+    """
+    Read how long the server asked us to wait.
+
+    Honors Retry-After (seconds or an HTTP date), and GitHub's
+    X-RateLimit-Remaining: 0 with X-RateLimit-Reset (epoch seconds).
+
+    Args:
+        response: requests-style response
+
+    Returns:
+        Seconds to wait, or None if the response doesn't say
+    """
+    headers = response.headers
+
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+        try:
+            # One extra second so the window has really rolled over
+            return max(0.0, float(headers['X-RateLimit-Reset']) - time.time()) + 1.0
+        except ValueError:
+            pass
+
+    return None
+
+
+def is_retryable(response: Any, idempotent: bool = True) -> bool:
+    """
+    Decide whether a response is a transient failure.
+
+    Args:
+        response: requests-style response
+        idempotent: Whether the request can be repeated safely after a
+            server error (rate-limit rejections are always safe to repeat)
+
+    Returns:
+        True if the request should be retried
+    """
+    status = response.status_code
+    if status in RATE_LIMIT_STATUSES:
+        return True
+    # GitHub reports an exhausted primary rate limit as 403, and its secondary
+    # rate limit as 403 with Retry-After but a non-zero remaining count
+    if status == 403 and (response.headers.get('X-RateLimit-Remaining') == '0'
+                          or response.headers.get('Retry-After')):
+        return True
+    return idempotent and status in SERVER_ERROR_STATUSES
+
+
+def backoff_delay(attempt: int, base_delay: float = DEFAULT_BASE_DELAY, max_delay: float = DEFAULT_MAX_DELAY) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt: Zero-based retry number
+        base_delay: Delay scale in seconds
+        max_delay: Upper bound in seconds
+
+    Returns:
+        Random delay between 0 and min(max_delay, base_delay * 2**attempt)
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(
+    send: Callable[[], Any],
+    idempotent: bool = True,
+    attempts: int = DEFAULT_ATTEMPTS,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    max_wait: float = DEFAULT_MAX_WAIT
+) -> Any:
+    """
+    Call send() until it returns a non-transient response or attempts run out.
+
+    Connection errors and timeouts (OSError, which requests' exceptions
+    subclass) are retried only for idempotent requests. The last response
+    is returned as-is, so callers still call raise_for_status().
+
+    Args:
+        send: Zero-argument callable performing one request
+        idempotent: Whether the request can be repeated after a server error
+            or a dropped connection
+        attempts: Maximum number of calls
+        base_delay: Backoff scale in seconds
+        max_delay: Backoff cap in seconds
+        max_wait: Longest server-requested wait to sleep through; a longer
+            Retry-After/rate-limit reset returns the response immediately
+
+    Returns:
+        Response from the last call
+    """
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+
+        try:
+            response = send()
+        except OSError:
+            if not idempotent or last_attempt:
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            continue
+
+        if last_attempt or not is_retryable(response, idempotent):
+            return response
+
+        delay = server_delay(response)
+        if delay is None:
+            delay = backoff_delay(attempt, base_delay, max_delay)
+        elif delay > max_wait:
+            return response
+
+        time.sleep(delay)
+
+    return response
+
+
+def with_retry(session: Any, **options: Any) -> Any:
+    """
+    Make every request sent through a requests.Session retry transient failures.
+
+    Args:
+        session: requests.Session (or compatible object with request())
+        **options: call_with_retry() options (attempts, base_delay, ...)
+
+    Returns:
+        The same session, for chaining
+    """
+    send = session.request
+
+    def request(method, url, *args, **kwargs):
+        return call_with_retry(
+            lambda: send(method, url, *args, **kwargs),
+            idempotent=method.upper() in IDEMPOTENT_METHODS,
+            **options
+        )
+
+    session.request = request
+    return session
@@ -0,0 +1,173 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = []
+# requires-python = ">=3.9"
+# ///
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".local" / "todu"
+PROJECTS_FILE = CACHE_DIR / "projects.json"
+
+# Plugin sync scripts, relative to the marketplace root
+PLUGINS_ROOT = Path(__file__).parent.parent.parent
+SYNC_SCRIPTS = {
+    'github': PLUGINS_ROOT / "github" / "scripts" / "sync-issues.py",
+    'forgejo': PLUGINS_ROOT / "forgejo" / "scripts" / "sync-issues.py",
+    'todoist': PLUGINS_ROOT / "todoist" / "scripts" / "sync-tasks.py",
+}
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 300  # seconds per project
+
+def load_projects():
+    """Load projects from projects.json."""
+    if not PROJECTS_FILE.exists():
+        return {}
+
+    try:
+        with open(PROJECTS_FILE) as f:
+            return json.load(f)
+    except Exception as e:
+        print(json.dumps({"error": f"Failed to load projects.json: {e}"}), file=sys.stderr)
+        return {}
+
+def build_sync_command(project, full=False):
+    """Build the plugin sync command for a registered project."""
+    system = project.get('system')
+    repo = project.get('repo')
+
+    if system == 'todoist':
+        return [str(SYNC_SCRIPTS['todoist']), "--project-id", repo]
+
+    command = [str(SYNC_SCRIPTS[system]), "--repo", repo]
+    if full:
+        command.append("--full")
+
+    # Forgejo can't detect its base URL from a git remote here
+    if system == 'forgejo':
+        base_url = project.get('baseUrl') or os.environ.get('FORGEJO_URL')
+        if base_url:
+            command.extend(["--base-url", base_url])
+
+    return command
+
+def parse_json_output(text):
+    """Parse a sync script's JSON output, or None if it isn't JSON."""
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+def run_project_sync(nickname, project, timeout=DEFAULT_TIMEOUT, full=False):
+    """Run one project's sync within a time budget and summarize the outcome."""
+    summary = {
+        "nickname": nickname,
+        "system": project.get('system'),
+        "repo": project.get('repo'),
+    }
+    started = time.monotonic()
+
+    try:
+        # Own session: the script runs under the uv launcher, so on timeout
+        # the whole process group is killed, not just the launcher
+        process = subprocess.Popen(
+            build_sync_command(project, full),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=os.environ.copy(),
+            start_new_session=True
+        )
+    except OSError as e:
+        summary["success"] = False
+        summary["error"] = f"Failed to start sync: {e}"
+    else:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.communicate()
+            summary["success"] = False
+            summary["error"] = f"Sync exceeded time budget of {timeout}s"
+        else:
+            if process.returncode == 0:
+                summary["success"] = True
+                summary["result"] = parse_json_output(stdout)
+            else:
+                summary["success"] = False
+                error = parse_json_output(stderr)
+                if isinstance(error, dict) and error.get('error'):
+                    summary["error"] = error['error']
+                else:
+                    summary["error"] = stderr.strip() or f"Sync exited with code {process.returncode}"
+
+    summary["duration"] = round(time.monotonic() - started, 2)
+    return summary
+
+def sync_all(system=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, full=False):
+    """Sync every registered project concurrently and print a merged summary."""
+    projects = load_projects()
+
+    # Filter by system if specified, skipping entries we can't sync
+    projects = {
+        nickname: project for nickname, project in sorted(projects.items())
+        if project.get('system') in SYNC_SCRIPTS and project.get('repo')
+        and (not system or project.get('system') == system)
+    }
+
+    if not projects:
+        print(json.dumps({"error": "No registered projects to sync. Register projects first."}), file=sys.stderr)
+        return 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        summaries = list(executor.map(
+            lambda entry: run_project_sync(entry[0], entry[1], timeout, full),
+            projects.items()
+        ))
+
+    succeeded = sum(1 for summary in summaries if summary["success"])
+    result = {
+        "projects": summaries,
+        "succeeded": succeeded,
+        "failed": len(summaries) - succeeded,
+        "duration": round(time.monotonic() - started, 2),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+    print(json.dumps(result, indent=2))
+    return 0 if succeeded == len(summaries) else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync all registered projects concurrently')
+    parser.add_argument('--system', choices=['github', 'forgejo', 'todoist'], help='Only sync projects for this system')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum number of syncs to run at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Time budget per project in seconds (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--full', action='store_true', help='Force full syncs for GitHub/Forgejo instead of incremental')
+
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than 0")
+
+    return sync_all(args.system, args.concurrency, args.timeout, args.full)
+
+if __name__ == '__main__':
+    sys.exit(main())
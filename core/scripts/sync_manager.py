@@ -7,14 +7,23 @@ that tracks sync state across all systems (GitHub, Forgejo, Todoist).
 """
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from atomic_io import atomic_write_json, file_lock
+
 
 # Unified sync file location
 SYNC_FILE = Path.home() / ".local" / "todu" / "sync.json"
 
+# Progress of interrupted syncs, one file per repo/project
+CHECKPOINT_DIR = Path.home() / ".local" / "todu" / "checkpoints"
+
+# How far before a listing's start its incremental cursor is set, to absorb
+# clock skew between this machine and the server
+CURSOR_OVERLAP = timedelta(minutes=5)
+
 
 def read_sync_metadata() -> Dict[str, Any]:
     """
@@ -39,7 +48,9 @@ def update_sync_metadata(
     mode: str,
     task_count: int,
     stats: Optional[Dict[str, int]] = None,
-    project_id: Optional[str] = None
+    project_id: Optional[str] = None,
+    repo: Optional[str] = None,
+    cursor: Optional[str] = None
 ) -> None:
     """
     Update sync metadata for a specific system.
@@ -48,15 +59,18 @@ def update_sync_metadata(
         system: System name ('github', 'forgejo', or 'todoist')
         mode: Sync mode ('full', 'incremental', or 'single')
         task_count: Total number of tasks/issues synced
-        stats: Optional detailed stats dict with 'new', 'updated', 'total' keys
+        stats: Optional detailed stats dict with 'new', 'updated', 'unchanged', 'total' keys
         project_id: Optional project ID (for Todoist project-specific syncs)
+        repo: Optional repo/project the sync covered; its entry under "repos"
+            records this sync alongside the other repos' entries
+        cursor: Optional new incremental cursor for repo (e.g. highest
+            updated_at seen). The previous cursor is kept when None.
     """
-    # Read existing metadata
-    metadata = read_sync_metadata()
+    now = datetime.now(timezone.utc).isoformat()
 
     # Create system-specific metadata
     system_data = {
-        "lastSync": datetime.now(timezone.utc).isoformat(),
+        "lastSync": now,
         "mode": mode,
         "taskCount": task_count
     }
@@ -67,15 +81,30 @@ def update_sync_metadata(
     if project_id:
         system_data["projectId"] = project_id
 
-    # Update the specific system's data
-    metadata[system] = system_data
+    # Lock the read-modify-write so parallel syncs don't drop each other's updates
+    with file_lock(SYNC_FILE):
+        metadata = read_sync_metadata()
 
-    # Ensure parent directory exists
-    SYNC_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Per-repo state is carried over so syncing one repo keeps the others' cursors
+        repos = metadata.get(system, {}).get("repos", {})
+        if repo:
+            repo_data = repos.get(repo, {})
+            repo_data.update({
+                "lastSync": now,
+                "mode": mode,
+                "taskCount": task_count
+            })
+            if cursor:
+                repo_data["cursor"] = cursor
+            repos[repo] = repo_data
+        if repos:
+            system_data["repos"] = repos
 
-    # Write back to file
-    with open(SYNC_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+        # Update the specific system's data
+        metadata[system] = system_data
+
+        # Replace the file atomically so readers never see partial JSON
+        atomic_write_json(SYNC_FILE, metadata)
 
 
 def get_system_sync_metadata(system: str) -> Optional[Dict[str, Any]]:
@@ -90,3 +119,98 @@ def get_system_sync_metadata(system: str) -> Optional[Dict[str, Any]]:
     """
     metadata = read_sync_metadata()
     return metadata.get(system)
+
+
+def get_sync_cursor(system: str, repo: str) -> Optional[str]:
+    """
+    Get the incremental sync cursor for one repo/project.
+
+    Args:
+        system: System name ('github', 'forgejo', or 'todoist')
+        repo: Repository in owner/name format, or project ID
+
+    Returns:
+        Cursor string stored by the last sync of that repo, or None
+    """
+    system_data = get_system_sync_metadata(system) or {}
+    return system_data.get("repos", {}).get(repo, {}).get("cursor")
+
+
+def listing_cursor(started_at: datetime) -> str:
+    """
+    Get the incremental cursor to store after a complete listing.
+
+    The cursor is the time the listing started (less CURSOR_OVERLAP), not
+    the highest updated_at it returned: an issue that changes while the
+    listing (or an interrupted and resumed listing) is in progress may be
+    returned with its old data or not at all, but its new updated_at is
+    after the start, so the next incremental sync picks it up.
+
+    Args:
+        started_at: When the listing (or the run a resume continues) started
+
+    Returns:
+        ISO timestamp for update_sync_metadata()
+    """
+    return (started_at - CURSOR_OVERLAP).isoformat()
+
+
+def checkpoint_path(system: str, repo: str) -> Path:
+    """
+    Get the checkpoint file for one repo/project's sync.
+
+    Args:
+        system: System name ('github', 'forgejo', or 'todoist')
+        repo: Repository in owner/name format, or project ID
+
+    Returns:
+        Path under ~/.local/todu/checkpoints/
+    """
+    return CHECKPOINT_DIR / f"{system}-{repo.replace('/', '_')}.json"
+
+
+def save_checkpoint(system: str, repo: str, checkpoint: Dict[str, Any]) -> None:
+    """
+    Record how far an in-progress sync got, so --resume can continue from there.
+
+    Args:
+        system: System name ('github', 'forgejo', or 'todoist')
+        repo: Repository in owner/name format, or project ID
+        checkpoint: System-specific progress (e.g. last page, highest updated_at)
+    """
+    data = dict(checkpoint)
+    data["savedAt"] = datetime.now(timezone.utc).isoformat()
+    atomic_write_json(checkpoint_path(system, repo), data)
+
+
+def load_checkpoint(system: str, repo: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the checkpoint left by an interrupted sync.
+
+    Args:
+        system: System name ('github', 'forgejo', or 'todoist')
+        repo: Repository in owner/name format, or project ID
+
+    Returns:
+        Checkpoint dict, or None if the last sync completed
+    """
+    path = checkpoint_path(system, repo)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def clear_checkpoint(system: str, repo: str) -> None:
+    """
+    Remove a sync's checkpoint once it has completed.
+
+    Args:
+        system: System name ('github', 'forgejo', or 'todoist')
+        repo: Repository in owner/name format, or project ID
+    """
+    checkpoint_path(system, repo).unlink(missing_ok=True)
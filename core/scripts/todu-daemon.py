@@ -0,0 +1,259 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = []
+# requires-python = ">=3.9"
+# ///
+
+import argparse
+import importlib.util
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from atomic_io import atomic_write_json
+
+# Import project loading and per-project sync from sync-all.py
+_sync_all_path = Path(__file__).parent / "sync-all.py"
+_spec = importlib.util.spec_from_file_location("sync_all", _sync_all_path)
+_sync_all = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync_all)
+
+load_projects = _sync_all.load_projects
+run_project_sync = _sync_all.run_project_sync
+SYNC_SCRIPTS = _sync_all.SYNC_SCRIPTS
+
+CACHE_DIR = Path.home() / ".local" / "todu"
+STATE_FILE = CACHE_DIR / "daemon.json"
+PID_FILE = CACHE_DIR / "daemon.pid"
+
+# Adaptive polling bounds, in seconds
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 3600
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = _sync_all.DEFAULT_TIMEOUT
+
+# How often projects.json is re-read for added or removed projects
+RELOAD_INTERVAL = 60
+
+# Longest wait between checks for a stop signal while syncs are running
+STOP_POLL_INTERVAL = 1.0
+
+def project_key(project):
+    """Identify a project by what it syncs, so renames keep their schedule."""
+    return f"{project.get('system')}:{project.get('repo')}"
+
+def sync_changed(summary):
+    """Whether a sync brought in any new, updated or deleted items."""
+    result = summary.get("result") or {}
+    return any(result.get(field) for field in ["new", "updated", "deleted"])
+
+def next_interval(interval, summary, min_interval, max_interval):
+    """
+    Adapt a project's polling interval to its last sync.
+
+    Busy projects (the sync changed something) are polled twice as often,
+    quiet or failing ones half as often, within [min_interval, max_interval].
+    """
+    if summary["success"] and sync_changed(summary):
+        return max(min_interval, interval / 2)
+    return min(max_interval, interval * 2)
+
+def load_state():
+    """Load the saved schedule so a restarted daemon keeps its intervals."""
+    if not STATE_FILE.exists():
+        return {}
+
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f).get("projects", {})
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+def save_state(schedule):
+    """Write the current schedule for status checks and restarts."""
+    atomic_write_json(STATE_FILE, {
+        "pid": os.getpid(),
+        "updatedAt": datetime.now(timezone.utc).isoformat(),
+        "projects": schedule
+    })
+
+def refresh_schedule(schedule, min_interval, system=None):
+    """
+    Sync the schedule with projects.json.
+
+    New projects are due immediately; removed ones are dropped.
+    """
+    projects = {
+        project_key(project): (nickname, project)
+        for nickname, project in sorted(load_projects().items())
+        if project.get('system') in SYNC_SCRIPTS and project.get('repo')
+        and (not system or project.get('system') == system)
+    }
+
+    for key in list(schedule):
+        if key not in projects:
+            del schedule[key]
+
+    for key, (nickname, project) in projects.items():
+        entry = schedule.setdefault(key, {"interval": min_interval, "nextRun": 0})
+        entry["nickname"] = nickname
+        entry["project"] = project
+
+    return schedule
+
+def running_daemon_pid():
+    """Return the PID of a live daemon from the PID file, or None."""
+    try:
+        pid = int(PID_FILE.read_text().strip())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+def log(event):
+    """Print one JSON log line."""
+    event["timestamp"] = datetime.now(timezone.utc).isoformat()
+    print(json.dumps(event), flush=True)
+
+def submit_due(schedule, running, executor, timeout):
+    """Start a sync for every due project that isn't already syncing."""
+    now = time.time()
+    syncing = set(running.values())
+    for key, entry in schedule.items():
+        if entry["nextRun"] <= now and key not in syncing:
+            future = executor.submit(run_project_sync, entry["nickname"], entry["project"], timeout)
+            running[future] = key
+
+def finish_sync(schedule, key, summary, min_interval, max_interval):
+    """Reschedule a project from its finished sync and log the outcome."""
+    entry = schedule.get(key)
+    if entry is None:
+        # Removed from projects.json while it was syncing
+        return
+
+    entry["interval"] = next_interval(entry["interval"], summary, min_interval, max_interval)
+    entry["nextRun"] = time.time() + entry["interval"]
+    entry["lastRun"] = datetime.now(timezone.utc).isoformat()
+    entry["lastSuccess"] = summary["success"]
+
+    log({
+        "event": "sync",
+        "nickname": summary["nickname"],
+        "system": summary["system"],
+        "success": summary["success"],
+        "duration": summary["duration"],
+        "result": summary.get("result"),
+        "error": summary.get("error"),
+        "nextInterval": round(entry["interval"])
+    })
+
+def persist(schedule):
+    """Save the schedule without the project definitions (those live in projects.json)."""
+    save_state({
+        key: {k: v for k, v in entry.items() if k != "project"}
+        for key, entry in schedule.items()
+    })
+
+def run_daemon(system=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+               min_interval=DEFAULT_MIN_INTERVAL, max_interval=DEFAULT_MAX_INTERVAL, once=False):
+    """Keep the cache warm by syncing registered projects on adaptive intervals."""
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    running = running_daemon_pid()
+    if running:
+        print(json.dumps({"error": f"todu daemon is already running (pid {running})"}), file=sys.stderr)
+        return 1
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    PID_FILE.write_text(str(os.getpid()))
+
+    # Restore saved intervals; everything is due on startup
+    schedule = {key: {"interval": entry.get("interval", min_interval), "nextRun": 0}
+                for key, entry in load_state().items()}
+    next_reload = 0
+
+    log({"event": "start", "pid": os.getpid()})
+
+    # Future -> schedule key of every sync in progress. Each project is
+    # rescheduled as soon as its own sync finishes, so a slow project doesn't
+    # hold back the others.
+    running = {}
+    submitted = False
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while not stop.is_set():
+                if time.time() >= next_reload:
+                    refresh_schedule(schedule, min_interval, system)
+                    next_reload = time.time() + RELOAD_INTERVAL
+
+                # --once runs the projects due at startup and nothing else
+                if not (once and submitted):
+                    submit_due(schedule, running, executor, timeout)
+                    submitted = True
+
+                if once and not running:
+                    break
+
+                # Wake when the next idle project is due (or projects.json is re-read)
+                syncing = set(running.values())
+                wake = min([entry["nextRun"] for key, entry in schedule.items() if key not in syncing] + [next_reload])
+                delay = max(0.0, wake - time.time())
+
+                if running:
+                    done, _ = wait(running, timeout=min(delay, STOP_POLL_INTERVAL), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish_sync(schedule, running.pop(future), future.result(), min_interval, max_interval)
+                    if done:
+                        persist(schedule)
+                else:
+                    persist(schedule)
+                    stop.wait(max(1.0, delay))
+
+            # Don't start queued syncs after a stop; running ones finish within their budget
+            executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        PID_FILE.unlink(missing_ok=True)
+        log({"event": "stop", "pid": os.getpid()})
+
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep the todu cache warm by syncing registered projects in the background')
+    parser.add_argument('--system', choices=['github', 'forgejo', 'todoist'], help='Only sync projects for this system')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum number of syncs to run at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Time budget per project sync in seconds (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--min-interval', type=float, default=DEFAULT_MIN_INTERVAL,
+                        help=f'Shortest polling interval for busy projects in seconds (default: {DEFAULT_MIN_INTERVAL})')
+    parser.add_argument('--max-interval', type=float, default=DEFAULT_MAX_INTERVAL,
+                        help=f'Longest polling interval for idle projects in seconds (default: {DEFAULT_MAX_INTERVAL})')
+    parser.add_argument('--once', action='store_true', help='Run one round of due syncs and exit')
+
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than 0")
+    if args.min_interval <= 0 or args.max_interval < args.min_interval:
+        parser.error("--min-interval must be greater than 0 and at most --max-interval")
+
+    return run_daemon(args.system, args.concurrency, args.timeout, args.min_interval, args.max_interval, args.once)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = [
+#   "PyGithub>=2.1.1",
+#   "requests>=2.31.0",
+# ]
+# requires-python = ">=3.9"
+# ///
+
+import argparse
+import hashlib
+import hmac
+import importlib.util
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import item_store
+from atomic_io import atomic_write_json
+
+PLUGINS_ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+
+# Event header and signature header per system. Forgejo also sends the
+# Gitea headers, which older servers use exclusively.
+EVENT_HEADERS = {
+    'github': ['X-GitHub-Event'],
+    'forgejo': ['X-Forgejo-Event', 'X-Gitea-Event'],
+}
+SIGNATURE_HEADERS = {
+    'github': ['X-Hub-Signature-256'],
+    'forgejo': ['X-Forgejo-Signature', 'X-Gitea-Signature'],
+}
+SECRET_ENV = {
+    'github': 'GITHUB_WEBHOOK_SECRET',
+    'forgejo': 'FORGEJO_WEBHOOK_SECRET',
+}
+
+ISSUE_EVENTS = ['issues', 'issue_comment']
+
+# Issue actions that remove the issue from its repo
+REMOVED_ACTIONS = ['deleted', 'transferred']
+
+_normalizers = {}
+_normalizers_lock = threading.Lock()
+
+def load_sync_module(system):
+    """Load a plugin's sync-issues.py to reuse its normalize_issue()."""
+    path = PLUGINS_ROOT / system / "scripts" / "sync-issues.py"
+    spec = importlib.util.spec_from_file_location(f"{system}_sync_issues", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def get_normalizer(system):
+    """Return a function turning a webhook issue payload into a normalized item."""
+    with _normalizers_lock:
+        if system not in _normalizers:
+            module = load_sync_module(system)
+            if system == 'github':
+                _normalizers[system] = lambda issue, repo: module.normalize_issue(module.rest_issue(issue), repo)
+            else:
+                _normalizers[system] = module.normalize_issue
+        return _normalizers[system]
+
+def header_value(headers, names):
+    """Return the first present header among names."""
+    for name in names:
+        value = headers.get(name)
+        if value:
+            return value
+    return None
+
+def detect_system(path, headers):
+    """Work out which system sent a delivery from the URL path or its event header."""
+    system = path.strip('/').split('/')[0]
+    if system in EVENT_HEADERS:
+        return system
+    for system, names in EVENT_HEADERS.items():
+        if header_value(headers, names):
+            return system
+    return None
+
+def verify_signature(system, headers, body, secret):
+    """
+    Check a delivery's HMAC-SHA256 signature.
+
+    GitHub sends 'sha256=<hex>'; Forgejo sends the bare hex digest.
+    """
+    signature = header_value(headers, SIGNATURE_HEADERS[system])
+    if not signature:
+        return False
+    if signature.startswith('sha256='):
+        signature = signature[len('sha256='):]
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+def parse_timestamp(value):
+    """Parse an ISO updatedAt value (with or without a trailing Z), or None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def apply_event(system, event, payload):
+    """
+    Apply one issues/issue_comment delivery to the cache.
+
+    Deliveries can arrive late or out of order (retries, replays), so an
+    issue is not written when the cached copy was updated more recently.
+
+    Returns:
+        Dict describing what was done (the HTTP response body)
+    """
+    if event not in ISSUE_EVENTS:
+        return {"ignored": f"event '{event}'"}
+
+    issue = payload.get('issue')
+    repo_name = (payload.get('repository') or {}).get('full_name')
+    if not issue or not repo_name:
+        return {"ignored": "payload has no issue or repository"}
+
+    if issue.get('pull_request') or payload.get('is_pull'):
+        return {"ignored": "pull request"}
+
+    action = payload.get('action')
+
+    with item_store.open_store() as conn:
+        if event == 'issues' and action in REMOVED_ACTIONS:
+            key = item_store.item_key({
+                'system': system,
+                'id': str(issue['number']),
+                'systemData': {'repo': repo_name}
+            })
+            item_store.delete_item(conn, key)
+            return {"key": key, "action": action, "outcome": "deleted"}
+
+        normalized = get_normalizer(system)(issue, repo_name)
+        key = item_store.item_key(normalized)
+
+        cached = item_store.get_item(conn, key)
+        cached_at = parse_timestamp((cached or {}).get('updatedAt'))
+        pushed_at = parse_timestamp(normalized.get('updatedAt'))
+        if cached_at and pushed_at and cached_at > pushed_at:
+            return {"key": key, "action": action, "outcome": "stale"}
+
+        outcome = item_store.write_item(conn, normalized)
+        return {"key": key, "action": action, "outcome": outcome}
+
+def record_delivery(record_dir, system, event, payload):
+    """Save a delivery in the format webhook-replay.py reads."""
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    atomic_write_json(Path(record_dir) / f"{stamp}-{system}-{event}.json", {
+        "system": system,
+        "event": event,
+        "payload": payload
+    })
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Accepts GitHub/Forgejo webhook deliveries on POST /github or /forgejo."""
+
+    secrets = {}
+    insecure = False
+    record_dir = None
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+
+        system = detect_system(self.path, self.headers)
+        if not system:
+            self.send_json(404, {"error": "Unknown webhook source; POST to /github or /forgejo"})
+            return
+
+        secret = self.secrets.get(system)
+        if secret:
+            if not verify_signature(system, self.headers, body, secret):
+                self.send_json(401, {"error": "Invalid webhook signature"})
+                return
+        elif not self.insecure:
+            self.send_json(401, {
+                "error": f"No webhook secret configured for {system}",
+                "help": f"Set {SECRET_ENV[system]} or start the receiver with --insecure"
+            })
+            return
+
+        event = header_value(self.headers, EVENT_HEADERS[system])
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self.send_json(400, {"error": "Payload is not JSON"})
+            return
+
+        if event == 'ping':
+            self.send_json(200, {"pong": True})
+            return
+
+        try:
+            if self.record_dir:
+                record_delivery(self.record_dir, system, event, payload)
+            result = apply_event(system, event, payload)
+        except Exception as e:
+            self.send_json(500, {"error": str(e), "type": type(e).__name__})
+            return
+
+        self.send_json(200 if "outcome" in result else 202, result)
+
+    def log_message(self, format, *args):
+        # One JSON line per request instead of the default access log
+        print(json.dumps({
+            "request": format % args,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }), file=sys.stderr, flush=True)
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, record_dir=None, insecure=False):
+    """
+    Run the webhook receiver until interrupted.
+
+    Deliveries for a system without a secret are rejected unless insecure
+    is set (e.g. for local testing with webhook-replay.py).
+    """
+    WebhookHandler.secrets = {
+        system: os.environ[env] for system, env in SECRET_ENV.items() if os.environ.get(env)
+    }
+    WebhookHandler.insecure = insecure
+    WebhookHandler.record_dir = record_dir
+    if record_dir:
+        Path(record_dir).mkdir(parents=True, exist_ok=True)
+
+    unsigned = [system for system in SECRET_ENV if system not in WebhookHandler.secrets]
+    if unsigned:
+        if insecure:
+            message = f"No webhook secret for {', '.join(unsigned)}; deliveries are accepted unverified (--insecure)"
+        else:
+            message = f"No webhook secret for {', '.join(unsigned)}; its deliveries will be rejected"
+        print(json.dumps({
+            "warning": message,
+            "help": f"Set {', '.join(SECRET_ENV[s] for s in unsigned)}"
+        }), file=sys.stderr)
+
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    print(json.dumps({"listening": f"http://{host}:{server.server_address[1]}"}), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Receive GitHub/Forgejo issue webhooks and apply them to the local cache')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Address to listen on (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--record', metavar='DIR', help='Also save each delivery to DIR for webhook-replay.py')
+    parser.add_argument('--insecure', action='store_true',
+                        help='Accept unsigned deliveries for systems without a webhook secret (local testing only)')
+
+    args = parser.parse_args()
+
+    return serve(args.host, args.port, args.record, args.insecure)
+
+if __name__ == '__main__':
+    sys.exit(main())
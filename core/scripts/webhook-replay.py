@@ -0,0 +1,122 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = []
+# requires-python = ">=3.9"
+# ///
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+DEFAULT_URL = "http://127.0.0.1:8787"
+
+SECRET_ENV = {
+    'github': 'GITHUB_WEBHOOK_SECRET',
+    'forgejo': 'FORGEJO_WEBHOOK_SECRET',
+}
+
+def load_deliveries(paths, system=None, event=None):
+    """
+    Read recorded deliveries from files or directories.
+
+    Files recorded by webhook-receiver.py --record carry their system and
+    event; a raw payload file needs --system and --event.
+    """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+
+    deliveries = []
+    for file_path in files:
+        with open(file_path) as f:
+            data = json.load(f)
+
+        if 'payload' in data and 'event' in data:
+            deliveries.append((file_path, data.get('system') or system, data['event'], data['payload']))
+        elif system and event:
+            deliveries.append((file_path, system, event, data))
+        else:
+            raise ValueError(f"{file_path} is a raw payload; pass --system and --event")
+
+    return deliveries
+
+def delivery_headers(system, event, body, secret):
+    """Build the headers GitHub or Forgejo would send with this body."""
+    headers = {'Content-Type': 'application/json'}
+    signature = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest() if secret else None
+
+    if system == 'github':
+        headers['X-GitHub-Event'] = event
+        if signature:
+            headers['X-Hub-Signature-256'] = f"sha256={signature}"
+    else:
+        headers['X-Forgejo-Event'] = event
+        headers['X-Gitea-Event'] = event
+        if signature:
+            headers['X-Forgejo-Signature'] = signature
+            headers['X-Gitea-Signature'] = signature
+
+    return headers
+
+def post_delivery(url, system, event, payload):
+    """POST one signed delivery to the receiver and return (status, response body)."""
+    body = json.dumps(payload).encode('utf-8')
+    headers = delivery_headers(system, event, body, os.environ.get(SECRET_ENV[system]))
+    request = urllib.request.Request(f"{url.rstrip('/')}/{system}", data=body, headers=headers, method='POST')
+
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read() or b'{}')
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}')
+
+def replay(paths, url=DEFAULT_URL, system=None, event=None):
+    """Post recorded deliveries to a running webhook-receiver.py in order."""
+    try:
+        deliveries = load_deliveries(paths, system, event)
+    except (OSError, ValueError) as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
+
+    results = []
+    for file_path, delivery_system, delivery_event, payload in deliveries:
+        if delivery_system not in SECRET_ENV:
+            print(json.dumps({"error": f"{file_path} has unknown system '{delivery_system}'"}), file=sys.stderr)
+            return 1
+
+        try:
+            status, response = post_delivery(url, delivery_system, delivery_event, payload)
+        except urllib.error.URLError as e:
+            print(json.dumps({"error": f"Could not reach receiver at {url}: {e.reason}"}), file=sys.stderr)
+            return 1
+
+        results.append({
+            "file": str(file_path),
+            "system": delivery_system,
+            "event": delivery_event,
+            "status": status,
+            "response": response
+        })
+
+    print(json.dumps(results, indent=2))
+    return 0 if all(result["status"] < 400 for result in results) else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded webhook deliveries against webhook-receiver.py')
+    parser.add_argument('paths', nargs='+', help='Recorded delivery files or directories of them')
+    parser.add_argument('--url', default=DEFAULT_URL, help=f'Receiver base URL (default: {DEFAULT_URL})')
+    parser.add_argument('--system', choices=list(SECRET_ENV), help='System for raw payload files')
+    parser.add_argument('--event', help='Event name for raw payload files (e.g., issues)')
+
+    args = parser.parse_args()
+
+    return replay(args.paths, args.url, args.system, args.event)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,51 +8,24 @@
 
 import argparse
 import json
-import os
 import sys
-import subprocess
 from pathlib import Path
 import requests
 
-def get_forgejo_url():
-    """Get Forgejo base URL from environment or git remote."""
-    # First check environment variable
-    if os.environ.get('FORGEJO_URL'):
-        return os.environ['FORGEJO_URL'].rstrip('/')
+# Import shared Forgejo client
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+from forgejo_client import get_forgejo_url, get_token, get_headers, get_session
 
-    # Try to extract from git remote
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        remote_url = result.stdout.strip()
-
-        # Parse URL to extract base domain
-        # Handle both SSH and HTTPS URLs
-        if remote_url.startswith('git@'):
-            # SSH format: git@forgejo.example.com:owner/repo.git
-            host = remote_url.split('@')[1].split(':')[0]
-            return f"https://{host}"
-        elif remote_url.startswith('http'):
-            # HTTPS format: https://forgejo.example.com/owner/repo.git
-            from urllib.parse import urlparse
-            parsed = urlparse(remote_url)
-            return f"{parsed.scheme}://{parsed.netloc}"
-    except Exception:
-        pass
-
-    print(json.dumps({"error": "FORGEJO_URL environment variable not set and could not detect from git remote"}), file=sys.stderr)
-    sys.exit(1)
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
 
 def create_comment(repo_name, issue_number, body):
     """Create a comment on a Forgejo issue and return JSON."""
-    token = os.environ.get('FORGEJO_TOKEN')
-    if not token:
-        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
-        sys.exit(1)
+    token = get_token()
+    session = get_session()
 
     base_url = get_forgejo_url()
 
@@ -60,16 +33,13 @@ def create_comment(repo_name, issue_number, body):
         # Forgejo API endpoint for creating issue comments
         api_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}/comments"
 
-        headers = {
-            'Authorization': f'token {token}',
-            'Content-Type': 'application/json'
-        }
+        headers = get_headers(token)
 
         payload = {
             'body': body
         }
 
-        response = requests.post(api_url, headers=headers, json=payload)
+        response = session.post(api_url, headers=headers, json=payload)
         response.raise_for_status()
 
         comment = response.json()
@@ -87,6 +57,17 @@ def create_comment(repo_name, issue_number, body):
             "repo": repo_name
         }
 
+        # A comment bumps the issue's updatedAt; refresh the cached copy
+        try:
+            with item_store.open_store() as conn:
+                key = item_store.item_key({'system': 'forgejo', 'id': str(issue_number), 'systemData': {'repo': repo_name}})
+                cached = item_store.get_item(conn, key)
+                if cached:
+                    item_store.write_item(conn, {**cached, 'updatedAt': result['updated_at']})
+        except Exception as e:
+            # Don't fail the comment if caching fails
+            print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
+
         print(json.dumps(result, indent=2))
         return 0
 
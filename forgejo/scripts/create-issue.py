@@ -7,58 +7,36 @@
 # ///
 
 import argparse
+import importlib.util
 import json
-import os
 import sys
-import subprocess
 from datetime import datetime
 from pathlib import Path
 import requests
 
-# Import shared label utilities
+# Import shared Forgejo client and label utilities
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
-from label_utils import ensure_labels_exist, get_label_ids
+from forgejo_client import get_forgejo_url, get_token, get_headers, get_session
+from label_utils import ensure_labels_exist, get_label_ids, invalidate_label_map
 
-def get_forgejo_url():
-    """Get Forgejo base URL from environment or git remote."""
-    # First check environment variable
-    if os.environ.get('FORGEJO_URL'):
-        return os.environ['FORGEJO_URL'].rstrip('/')
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
 
-    # Try to extract from git remote
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        remote_url = result.stdout.strip()
-
-        # Parse URL to extract base domain
-        # Handle both SSH and HTTPS URLs
-        if remote_url.startswith('git@'):
-            # SSH format: git@forgejo.example.com:owner/repo.git
-            host = remote_url.split('@')[1].split(':')[0]
-            return f"https://{host}"
-        elif remote_url.startswith('http'):
-            # HTTPS format: https://forgejo.example.com/owner/repo.git
-            from urllib.parse import urlparse
-            parsed = urlparse(remote_url)
-            return f"{parsed.scheme}://{parsed.netloc}"
-    except Exception:
-        pass
-
-    print(json.dumps({"error": "FORGEJO_URL environment variable not set and could not detect from git remote"}), file=sys.stderr)
-    sys.exit(1)
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-issues.py"
+_spec = importlib.util.spec_from_file_location("forgejo_sync_issues", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_issue = _sync.normalize_issue
 
 def create_issue(repo_name, title, body, labels=None):
     """Create a Forgejo issue and return normalized JSON."""
-    token = os.environ.get('FORGEJO_TOKEN')
-    if not token:
-        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
-        sys.exit(1)
+    token = get_token()
+    session = get_session()
 
     base_url = get_forgejo_url()
 
@@ -66,10 +44,7 @@ def create_issue(repo_name, title, body, labels=None):
         # Forgejo API endpoint for creating issues
         api_url = f"{base_url}/api/v1/repos/{repo_name}/issues"
 
-        headers = {
-            'Authorization': f'token {token}',
-            'Content-Type': 'application/json'
-        }
+        headers = get_headers(token)
 
         # ALWAYS ensure all standard labels exist in the repository
         from label_utils import VALID_STATUSES, VALID_PRIORITIES
@@ -92,11 +67,24 @@ def create_issue(repo_name, title, body, labels=None):
             if label_ids:
                 payload['labels'] = label_ids
 
-        response = requests.post(api_url, headers=headers, json=payload)
+        response = session.post(api_url, headers=headers, json=payload)
         response.raise_for_status()
 
         issue = response.json()
 
+        # Forgejo silently ignores unknown label IDs, so a cached ID for a
+        # label that was deleted and recreated leaves it off the new issue:
+        # drop the cached map, look the labels up again and set them once more
+        applied = {label['name'] for label in issue.get('labels') or []}
+        if labels and any(name not in applied for name in labels):
+            invalidate_label_map(base_url, repo_name)
+            label_map = ensure_labels_exist(base_url, headers, repo_name, labels)
+            labels_url = f"{api_url}/{issue['number']}/labels"
+            labels_payload = {'labels': [label_map[name] for name in labels if name in label_map]}
+            labels_response = session.put(labels_url, headers=headers, json=labels_payload)
+            labels_response.raise_for_status()
+            issue['labels'] = labels_response.json() or []
+
         # Return normalized format
         result = {
             "id": str(issue['number']),
@@ -117,20 +105,13 @@ def create_issue(repo_name, title, body, labels=None):
             }
         }
 
-        # Trigger background sync of the newly created issue
+        # Write the newly created issue straight into the cache
         try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-issues.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--repo", repo_name, "--issue", str(issue['number'])],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
+            with item_store.open_store() as conn:
+                item_store.write_item(conn, normalize_issue(issue, repo_name))
         except Exception as e:
-            # Don't fail issue creation if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+            # Don't fail issue creation if caching fails
+            print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
 
         print(json.dumps(result, indent=2))
         return 0
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Shared Forgejo API client: base URL detection, auth and a pooled HTTP session."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared retry/backoff layer lives in core
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core" / "scripts"))
+from retry import with_retry
+
+# Keep-alive connections held per host; raise it for concurrent page fetches
+DEFAULT_POOL_SIZE = 10
+
+_session = None
+
+
+def get_forgejo_url(cwd=None):
+    """Get the Forgejo base URL from FORGEJO_URL or the git remote in cwd.
+
+    Args:
+        cwd: Directory whose 'origin' remote is inspected (default: current directory)
+
+    Returns:
+        str: Base URL without a trailing slash (e.g., "https://forgejo.example.com")
+    """
+    # First check environment variable
+    if os.environ.get('FORGEJO_URL'):
+        return os.environ['FORGEJO_URL'].rstrip('/')
+
+    # Try to extract from git remote
+    try:
+        result = subprocess.run(
+            ['git', 'remote', 'get-url', 'origin'],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=cwd
+        )
+        remote_url = result.stdout.strip()
+
+        # Parse URL to extract base domain
+        # Handle both SSH and HTTPS URLs
+        if remote_url.startswith('ssh://git@'):
+            # SSH format: ssh://git@forgejo.example.com/owner/repo.git
+            host = remote_url.replace('ssh://git@', '').split('/')[0]
+            base_url = f"https://{host}"
+        elif remote_url.startswith('git@'):
+            # SSH format: git@forgejo.example.com:owner/repo.git
+            host = remote_url.split('@')[1].split(':')[0]
+            base_url = f"https://{host}"
+        elif remote_url.startswith('http'):
+            # HTTPS format: https://forgejo.example.com/owner/repo.git
+            parsed = urlparse(remote_url)
+            base_url = f"{parsed.scheme}://{parsed.netloc}"
+        else:
+            base_url = None
+    except Exception:
+        base_url = None
+
+    # Reject github.com
+    if base_url and 'github.com' in base_url:
+        print(json.dumps({
+            "error": "This appears to be a GitHub repository, not Forgejo",
+            "help": "Use the github plugin for GitHub repositories"
+        }), file=sys.stderr)
+        sys.exit(1)
+
+    if base_url:
+        return base_url
+
+    print(json.dumps({"error": "FORGEJO_URL environment variable not set and could not detect from git remote"}), file=sys.stderr)
+    sys.exit(1)
+
+
+def get_token():
+    """Get the Forgejo API token from FORGEJO_TOKEN, exiting if it is not set."""
+    token = os.environ.get('FORGEJO_TOKEN')
+    if not token:
+        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
+        sys.exit(1)
+    return token
+
+
+def get_headers(token):
+    """Build Forgejo API request headers.
+
+    Args:
+        token: Forgejo API token
+
+    Returns:
+        dict: Authorization and content type headers
+    """
+    return {
+        'Authorization': f'token {token}',
+        'Content-Type': 'application/json'
+    }
+
+
+def get_session(pool_size=DEFAULT_POOL_SIZE):
+    """Get the process-wide keep-alive session for Forgejo API calls.
+
+    Every request made through the session reuses pooled connections, so a
+    label lookup, an issue create and a follow-up fetch share one TLS
+    handshake, and retries 429/5xx responses honoring Retry-After. The
+    session is created on first use; later calls return it unchanged.
+
+    Args:
+        pool_size: Maximum pooled connections per host (at least the number
+            of concurrent requests the caller makes)
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _session = with_retry(session)
+    return _session
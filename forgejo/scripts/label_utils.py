@@ -1,8 +1,25 @@
 #!/usr/bin/env python3
 """Shared utilities for managing Forgejo labels."""
 
+import json
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
 import requests
 
+from forgejo_client import get_session
+
+# Add path to core scripts for atomic_io
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+from atomic_io import atomic_write_json, file_lock
+
+# Persistent label name -> ID maps, keyed by "host/owner/repo"
+LABEL_CACHE_FILE = Path.home() / ".local" / "todu" / "forgejo" / "labels.json"
+LABEL_CACHE_TTL = 3600  # seconds
+
 # Valid status and priority values
 VALID_STATUSES = ["backlog", "in-progress", "done", "canceled"]
 VALID_PRIORITIES = ["low", "medium", "high"]
@@ -19,6 +36,77 @@ LABEL_COLORS = {
 }
 
 
+def _label_cache_key(base_url, repo_name):
+    """Key a repo's label map by host, so repos with the same name on different servers don't collide."""
+    return f"{urlparse(base_url).netloc}/{repo_name}"
+
+
+def _load_label_cache():
+    """Read all cached label maps."""
+    try:
+        with open(LABEL_CACHE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_label_map(base_url, repo_name, label_map):
+    """Store a repo's label name -> ID map, merged with other repos' entries under a lock."""
+    with file_lock(LABEL_CACHE_FILE):
+        cache = _load_label_cache()
+        cache[_label_cache_key(base_url, repo_name)] = {
+            "fetchedAt": time.time(),
+            "labels": label_map
+        }
+        atomic_write_json(LABEL_CACHE_FILE, cache)
+
+
+def invalidate_label_map(base_url, repo_name):
+    """Drop a repo's cached label map, e.g. when Forgejo ignored one of its IDs."""
+    with file_lock(LABEL_CACHE_FILE):
+        cache = _load_label_cache()
+        if cache.pop(_label_cache_key(base_url, repo_name), None) is not None:
+            atomic_write_json(LABEL_CACHE_FILE, cache)
+
+
+def get_label_map(base_url, headers, repo_name, refresh=False):
+    """Get a repo's label name -> ID map, from the cache when it is fresh.
+
+    Args:
+        base_url: Forgejo base URL (e.g., "https://forgejo.example.com")
+        headers: Request headers with authorization
+        repo_name: Repository in "owner/repo" format
+        refresh: Fetch the label list even if the cached map is fresh
+
+    Returns:
+        tuple: (label map, whether it came from the cache)
+    """
+    if not refresh:
+        entry = _load_label_cache().get(_label_cache_key(base_url, repo_name))
+        if entry and time.time() - entry.get("fetchedAt", 0) < LABEL_CACHE_TTL:
+            return dict(entry["labels"]), True
+
+    api_url = f"{base_url}/api/v1/repos/{repo_name}/labels"
+    response = get_session().get(api_url, headers=headers)
+    response.raise_for_status()
+
+    label_map = {label['name']: label['id'] for label in response.json()}
+    save_label_map(base_url, repo_name, label_map)
+    return label_map, False
+
+
+def get_fresh_label_map(base_url, headers, repo_name, label_names):
+    """Get a label map covering label_names, refetching once if the cached map misses any.
+
+    A miss means the cache is stale (labels were added since it was fetched),
+    so the cached entry is replaced rather than trusted.
+    """
+    label_map, cached = get_label_map(base_url, headers, repo_name)
+    if cached and any(name not in label_map for name in label_names):
+        label_map, _ = get_label_map(base_url, headers, repo_name, refresh=True)
+    return label_map
+
+
 def ensure_labels_exist(base_url, headers, repo_name, required_labels):
     """Ensure required labels exist in the repository, creating them if necessary.
 
@@ -34,17 +122,12 @@ def ensure_labels_exist(base_url, headers, repo_name, required_labels):
     label_map = {}
 
     try:
-        # Get existing labels
+        # Get existing labels (cached per repo)
+        label_map = get_fresh_label_map(base_url, headers, repo_name, required_labels)
         api_url = f"{base_url}/api/v1/repos/{repo_name}/labels"
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        existing_labels = response.json()
-
-        # Build name -> ID mapping for existing labels
-        for label in existing_labels:
-            label_map[label['name']] = label['id']
 
         # Create missing labels
+        created = False
         for label_name in required_labels:
             if label_name not in label_map:
                 color = LABEL_COLORS.get(label_name, "#ededed")
@@ -56,10 +139,14 @@ def ensure_labels_exist(base_url, headers, repo_name, required_labels):
                     "description": description
                 }
 
-                create_response = requests.post(api_url, headers=headers, json=create_payload)
+                create_response = get_session().post(api_url, headers=headers, json=create_payload)
                 create_response.raise_for_status()
                 new_label = create_response.json()
                 label_map[label_name] = new_label['id']
+                created = True
+
+        if created:
+            save_label_map(base_url, repo_name, label_map)
     except requests.exceptions.RequestException as e:
         error_msg = str(e)
         if hasattr(e, 'response') and e.response is not None:
@@ -89,13 +176,7 @@ def get_label_ids(base_url, headers, repo_name, label_names):
         return []
 
     try:
-        api_url = f"{base_url}/api/v1/repos/{repo_name}/labels"
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        all_labels = response.json()
-
-        # Build name -> ID mapping
-        label_map = {label['name']: label['id'] for label in all_labels}
+        label_map = get_fresh_label_map(base_url, headers, repo_name, label_names)
 
         # Convert names to IDs
         label_ids = []
@@ -7,10 +7,12 @@
 # ///
 
 import argparse
+import itertools
 import json
-import os
+import math
 import sys
-import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 import requests
@@ -18,60 +20,18 @@ import requests
 # Add path to core scripts for sync_manager
 core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
 sys.path.insert(0, str(core_scripts_path))
-from sync_manager import update_sync_metadata
+from sync_manager import update_sync_metadata, get_sync_cursor, listing_cursor, load_checkpoint, save_checkpoint, clear_checkpoint
+import item_store
+from http_validators import load_validators, save_validators, validator_key, conditional_headers, response_validators
+
+sys.path.insert(0, str(Path(__file__).parent))
+from forgejo_client import DEFAULT_POOL_SIZE, get_forgejo_url, get_token, get_headers, get_session
 
 CACHE_DIR = Path.home() / ".local" / "todu" / "forgejo"
 ITEMS_DIR = Path.home() / ".local" / "todu" / "issues"
 
-def get_forgejo_url(cwd=None):
-    """Get Forgejo base URL from git remote in cwd."""
-    # Try to extract from git remote in the current directory
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=cwd
-        )
-        remote_url = result.stdout.strip()
-
-        # Parse URL to extract base domain
-        # Handle both SSH and HTTPS URLs
-        if remote_url.startswith('ssh://git@'):
-            # SSH format: ssh://git@forgejo.example.com/owner/repo.git
-            host = remote_url.replace('ssh://git@', '').split('/')[0]
-            base_url = f"https://{host}"
-        elif remote_url.startswith('git@'):
-            # SSH format: git@forgejo.example.com:owner/repo.git
-            host = remote_url.split('@')[1].split(':')[0]
-            base_url = f"https://{host}"
-        elif remote_url.startswith('http'):
-            # HTTPS format: https://forgejo.example.com/owner/repo.git
-            from urllib.parse import urlparse
-            parsed = urlparse(remote_url)
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-        else:
-            base_url = None
-
-        # Reject github.com
-        if base_url and 'github.com' in base_url:
-            print(json.dumps({
-                "error": "This appears to be a GitHub repository, not Forgejo",
-                "help": "Use the github plugin for GitHub repositories"
-            }), file=sys.stderr)
-            sys.exit(1)
-
-        if base_url:
-            return base_url
-    except Exception:
-        pass
-
-    print(json.dumps({
-        "error": "Could not detect Forgejo URL from git remote",
-        "help": "Make sure you are in a git repository with a Forgejo remote"
-    }), file=sys.stderr)
-    sys.exit(1)
+# Pages fetched concurrently during full/incremental syncs
+DEFAULT_WORKERS = 4
 
 def normalize_issue(issue, repo_name):
     """Convert Forgejo issue to normalized format."""
@@ -132,34 +92,154 @@ def normalize_issue(issue, repo_name):
 
     return normalized
 
-def sync_issues(repo_name, since=None, issue_number=None, base_url=None):
+def fetch_page(api_url, headers, params, page, validators=None, fresh=None):
+    """
+    Fetch one page of issues from the Forgejo API.
+
+    When the page has stored validators, the request is conditional and a
+    304 Not Modified returns None instead of the issues. New validators are
+    collected in `fresh` (saved by the caller once the sync completes).
+
+    Validators are keyed without `since`, which moves with every sync: a 304
+    still means the page's content is what the cache already holds.
+
+    Returns:
+        Tuple of (issues or None if not modified, total issue count or None,
+        number of issues on the page)
+    """
+    page_params = {**params, 'page': page}
+    key = validator_key(api_url, {k: v for k, v in page_params.items() if k != 'since'})
+    stored = validators.get(key) if validators else None
+
+    response = get_session().get(api_url, headers={**headers, **conditional_headers(stored)}, params=page_params)
+    if response.status_code == 304:
+        # Carry the stored entry over, so saving this sync's validators keeps it
+        if fresh is not None:
+            fresh[key] = stored
+        return None, stored.get('total'), stored.get('count', 0)
+    response.raise_for_status()
+    page_issues = response.json()
+
+    total = response.headers.get('X-Total-Count')
+    total = int(total) if total and total.isdigit() else None
+
+    if fresh is not None and page_issues:
+        entry = response_validators(response.headers, total=total, count=len(page_issues), since=params.get('since'))
+        if entry:
+            fresh[key] = entry
+
+    return page_issues, total, len(page_issues)
+
+def fetch_issue_pages(api_url, headers, params, workers=DEFAULT_WORKERS, validators=None, fresh=None, page_size=None):
+    """
+    Yield (page number, page size, issues) from the Forgejo API in page order,
+    starting at params['page'].
+
+    The first response's X-Total-Count header gives the page count, so the
+    remaining pages are fetched concurrently with at most `workers` requests
+    in flight. Without the header, pages are fetched one at a time until a
+    page shorter than the first one is returned.
+
+    Pages answered with 304 Not Modified are yielded with issues None.
+    `page_size` is the server's page size when already known (e.g. when
+    resuming), since a short first page can't reveal it.
+    """
+    def fetch(page):
+        return fetch_page(api_url, headers, params, page, validators, fresh)
+
+    first_issues, total, first_count = fetch(params['page'])
+    if not first_count:
+        return
+
+    # The server may cap the requested limit, so use the real page size
+    page_size = page_size or first_count
+    yield params['page'], page_size, first_issues
+
+    if total is None:
+        # A capped limit and a short last page look alike, so keep going
+        # until a page is shorter than the first one (or empty)
+        page = params['page'] + 1
+        while True:
+            page_issues, _, count = fetch(page)
+            if not count:
+                return
+            yield page, page_size, page_issues
+            if count < page_size:
+                return
+            page += 1
+
+    last_page = math.ceil(total / page_size)
+    remaining = iter(range(params['page'] + 1, last_page + 1))
+
+    # Sliding window: submit ahead up to `workers` pages, yield in order
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for page in itertools.islice(remaining, workers):
+            in_flight.append(executor.submit(fetch, page))
+
+        page = params['page']
+        while in_flight:
+            page += 1
+            page_issues, _, count = in_flight.popleft().result()
+            for next_page in itertools.islice(remaining, 1):
+                in_flight.append(executor.submit(fetch, next_page))
+            if count:
+                yield page, page_size, page_issues
+
+def without_pull_requests(pages):
+    """Filter pull requests out of each page of issues."""
+    for page, page_size, page_issues in pages:
+        if page_issues is not None:
+            page_issues = [issue for issue in page_issues if not issue.get('pull_request')]
+        yield page, page_size, page_issues
+
+def normalize_pages(pages, repo_name):
+    """Normalize each page of Forgejo issues."""
+    for page, page_size, page_issues in pages:
+        if page_issues is not None:
+            page_issues = [normalize_issue(issue, repo_name) for issue in page_issues]
+        yield page, page_size, page_issues
+
+def sync_issues(repo_name, since=None, issue_number=None, base_url=None, full=False, workers=DEFAULT_WORKERS, resume=False):
     """Sync Forgejo issues to local cache."""
-    token = os.environ.get('FORGEJO_TOKEN')
-    if not token:
-        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
-        sys.exit(1)
+    token = get_token()
+    # One pooled connection per concurrent page fetch
+    session = get_session(pool_size=max(workers, DEFAULT_POOL_SIZE))
 
     if not base_url:
         base_url = get_forgejo_url()
 
     try:
-        headers = {
-            'Authorization': f'token {token}',
-            'Content-Type': 'application/json'
-        }
+        headers = get_headers(token)
 
         # Create cache directory
         ITEMS_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Use repo name prefix in filename to avoid conflicts
-        # Replace '/' with '_' for valid filename
-        repo_prefix = repo_name.replace('/', '_')
+        # Continue an interrupted listing from its checkpoint
+        checkpoint = load_checkpoint("forgejo", repo_name) if resume else None
+        if checkpoint:
+            since = datetime.fromisoformat(checkpoint['since']) if checkpoint.get('since') else None
+
+        # A resumed listing keeps the original start, so issues that changed
+        # on already-written pages before the resume are caught next time
+        started_at = datetime.now(timezone.utc)
+        if checkpoint and checkpoint.get('startedAt'):
+            started_at = datetime.fromisoformat(checkpoint['startedAt'])
+
+        # Default to incremental from this repo's cursor unless a full sync is requested
+        if not since and not issue_number and not full and not checkpoint:
+            cursor = get_sync_cursor("forgejo", repo_name)
+            if cursor:
+                since = datetime.fromisoformat(cursor)
+
+        # Validators from this sync's responses, saved once every page is written
+        fresh_validators = {}
 
         # Fetch issues based on mode
         if issue_number:
             # Single issue mode
             api_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}"
-            response = requests.get(api_url, headers=headers)
+            response = session.get(api_url, headers=headers)
             response.raise_for_status()
             issue = response.json()
 
@@ -168,7 +248,7 @@ def sync_issues(repo_name, since=None, issue_number=None, base_url=None):
                 print(json.dumps({"error": f"Issue #{issue_number} is a pull request, not an issue"}), file=sys.stderr)
                 return 1
 
-            issues = [issue]
+            pages = iter([(1, 1, [issue])])
             sync_mode = "single"
         else:
             # Full or incremental sync mode
@@ -185,56 +265,90 @@ def sync_issues(repo_name, since=None, issue_number=None, base_url=None):
             else:
                 sync_mode = "full"
 
-            issues = []
-            while True:
-                response = requests.get(api_url, headers=headers, params=params)
-                response.raise_for_status()
-                page_issues = response.json()
-
-                if not page_issues:
-                    break
+            page_size = None
+            if checkpoint:
+                # Re-read the last written page: issues created or deleted
+                # since the interruption shift the rest between pages
+                params['page'] = checkpoint['page']
+                page_size = checkpoint['pageSize']
 
-                # Filter out pull requests
-                issues.extend([i for i in page_issues if not i.get('pull_request')])
-
-                params['page'] += 1
+            # Conditional requests skip unchanged pages; --full re-downloads everything
+            validators = None if full else load_validators()
+            pages = fetch_issue_pages(api_url, headers, params, workers, validators, fresh_validators, page_size)
 
         new_count = 0
         updated_count = 0
-
-        for issue in issues:
-            # Use system and repo prefix in filename to avoid conflicts
-            issue_file = ITEMS_DIR / f"forgejo-{repo_prefix}-{issue['number']}.json"
-            is_new = not issue_file.exists()
-
-            # Save normalized issue
-            normalized = normalize_issue(issue, repo_name)
-            with open(issue_file, 'w') as f:
-                json.dump(normalized, f, indent=2)
-
-            if is_new:
-                new_count += 1
-            else:
-                updated_count += 1
+        unchanged_count = 0
+        not_modified_pages = 0
+
+        # Pipeline: fetch page -> filter PRs -> normalize -> write. At most
+        # `workers` pages are in flight, and each page is committed once
+        # written, so written pages survive a later failure.
+        with item_store.open_store() as conn:
+            for page, page_size, page_issues in normalize_pages(without_pull_requests(pages), repo_name):
+                for normalized in page_issues or []:
+                    # Save normalized issue (skipped when its content hash is unchanged)
+                    outcome = item_store.write_item(conn, normalized)
+                    if outcome == 'new':
+                        new_count += 1
+                    elif outcome == 'updated':
+                        updated_count += 1
+                    else:
+                        unchanged_count += 1
+
+                if page_issues is None:
+                    # 304 Not Modified: the cached issues from this page are current
+                    not_modified_pages += 1
+
+                conn.commit()
+
+                # Record progress so --resume can continue after this page
+                if sync_mode != "single":
+                    save_checkpoint("forgejo", repo_name, {
+                        "since": since.isoformat() if since else None,
+                        "page": page,
+                        "pageSize": page_size,
+                        "startedAt": started_at.isoformat()
+                    })
+
+        # Only a complete listing may advance the cursor or store validators
+        cursor = listing_cursor(started_at) if sync_mode != "single" else None
+        if sync_mode != "single":
+            save_validators(fresh_validators, replace=api_url)
+            clear_checkpoint("forgejo", repo_name)
 
         # Update sync metadata in unified file
         update_sync_metadata(
             system="forgejo",
             mode=sync_mode,
-            task_count=new_count + updated_count
+            repo=repo_name,
+            cursor=cursor,
+            task_count=new_count + updated_count + unchanged_count,
+            stats={
+                "new": new_count,
+                "updated": updated_count,
+                "unchanged": unchanged_count,
+                "total": new_count + updated_count + unchanged_count
+            }
         )
 
         result = {
-            "synced": new_count + updated_count,
+            "synced": new_count + updated_count + unchanged_count,
             "new": new_count,
             "updated": updated_count,
+            "unchanged": unchanged_count,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "mode": sync_mode
         }
 
+        if not_modified_pages:
+            result["notModified"] = not_modified_pages
+
         # Add issue number for single issue sync
         if issue_number:
             result["issue"] = f"#{issue_number}"
+        elif since:
+            result["since"] = since.isoformat()
 
         print(json.dumps(result, indent=2))
         return 0
@@ -264,19 +378,29 @@ def sync_issues(repo_name, since=None, issue_number=None, base_url=None):
 def main():
     parser = argparse.ArgumentParser(description='Sync Forgejo issues to local cache')
     parser.add_argument('--repo', required=True, help='Repository in owner/name format')
-    parser.add_argument('--since', help='ISO timestamp to fetch issues since')
+    parser.add_argument('--since', help='ISO timestamp to fetch issues since (default: last sync cursor for this repo)')
     parser.add_argument('--issue', type=int, help='Sync specific issue number')
+    parser.add_argument('--full', action='store_true', help='Fetch all issues, ignoring the incremental sync cursor')
     parser.add_argument('--base-url', help='Forgejo base URL (e.g., https://forgejo.example.com)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted sync from its checkpoint')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Number of pages to fetch concurrently (default: {DEFAULT_WORKERS})')
 
     args = parser.parse_args()
 
-    # Make --issue and --since mutually exclusive
-    if args.issue and args.since:
-        parser.error("Cannot specify both --issue and --since")
+    # Make --issue, --since and --full mutually exclusive
+    if sum(bool(x) for x in [args.issue, args.since, args.full]) > 1:
+        parser.error("Only one of --issue, --since or --full can be specified")
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
     since = datetime.fromisoformat(args.since.replace('Z', '+00:00')) if args.since else None
 
-    return sync_issues(args.repo, since, args.issue, args.base_url)
+    if args.resume and (args.issue or args.since):
+        parser.error("--resume cannot be combined with --issue or --since")
+
+    return sync_issues(args.repo, since, args.issue, args.base_url, args.full, args.workers, args.resume)
 
 if __name__ == '__main__':
     sys.exit(main())
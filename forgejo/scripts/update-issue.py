@@ -7,229 +7,268 @@
 # ///
 
 import argparse
+import importlib.util
 import json
-import os
 import sys
-import subprocess
 from pathlib import Path
 import requests
 
-# Import shared label utilities
+# Import shared Forgejo client and label utilities
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
-from label_utils import ensure_labels_exist, VALID_STATUSES, VALID_PRIORITIES
+from forgejo_client import get_forgejo_url, get_token, get_headers, get_session
+from label_utils import ensure_labels_exist, invalidate_label_map, VALID_STATUSES, VALID_PRIORITIES
+
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+from bulk_ops import DEFAULT_CONCURRENCY, parse_ids, load_operations, run_operations, summarize
+
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-issues.py"
+_spec = importlib.util.spec_from_file_location("forgejo_sync_issues", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_issue = _sync.normalize_issue
+
+# Fields an --ops-file line may set besides "issue"
+UPDATE_FIELDS = ["status", "priority", "close", "cancel", "title", "body"]
+
+def apply_update(base_url, headers, repo_name, issue_number, status=None, priority=None, close=False,
+                 cancel=False, title=None, body=None, label_map=None):
+    """
+    Apply one update to a Forgejo issue and return the updated issue JSON.
+
+    label_map (name -> ID) can be passed in when the caller already looked
+    the labels up, e.g. once for a whole batch.
+
+    Raises:
+        ValueError: If the update is invalid or the issue is a pull request
+        RuntimeError: If Forgejo still drops a required label after a label refetch
+        requests.exceptions.RequestException: If an API call fails
+    """
+    session = get_session()
+
+    # Validate before touching the issue
+    if not any([status, priority, close, cancel, title is not None, body is not None]):
+        raise ValueError("Must specify at least one of: status, priority, close, cancel, title, or body")
+    if close and cancel:
+        raise ValueError("Cannot specify both close and cancel")
+    if status and status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}")
+    if priority and priority not in VALID_PRIORITIES:
+        raise ValueError(f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}")
+
+    # Get current issue state
+    api_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}"
+    response = session.get(api_url, headers=headers)
+    response.raise_for_status()
+    issue = response.json()
+
+    # Check if it's a pull request
+    if issue.get('pull_request'):
+        raise ValueError(f"Issue #{issue_number} is a pull request, not an issue")
+
+    # Get current labels (as IDs)
+    current_label_ids = [label['id'] for label in issue.get('labels', [])]
+    current_label_names = [label['name'] for label in issue.get('labels', [])]
+
+    # Handle cancel (sets status:canceled and closes)
+    if cancel:
+        status = "canceled"
+        close = True
+
+    # Handle close without explicit status (defaults to done)
+    if close and not status:
+        status = "done"
+
+    # Determine which labels we need to add
+    required_label_names = []
+    if status:
+        required_label_names.append(f"status:{status}")
+    if priority:
+        required_label_names.append(f"priority:{priority}")
+
+    # Ensure required labels exist in the repository and get their IDs
+    if label_map is None or any(name not in label_map for name in required_label_names):
+        label_map = ensure_labels_exist(base_url, headers, repo_name, required_label_names)
+
+    # Build new label ID list
+    kept_label_ids = []
+    for label_id, label_name in zip(current_label_ids, current_label_names):
+        # Remove old status label only if setting new status
+        if label_name.startswith('status:') and status:
+            continue
+        # Remove old priority label only if setting new priority
+        if label_name.startswith('priority:') and priority:
+            continue
+        # Keep all other labels
+        kept_label_ids.append(label_id)
+
+    # Update labels using dedicated labels endpoint. Forgejo silently ignores
+    # unknown IDs, so a cached ID for a label that was deleted and recreated
+    # shows up as a required label missing from the response: drop the cached
+    # map, look the labels up again and retry once.
+    if kept_label_ids or status or priority:
+        labels_url = f"{api_url}/labels"
+        for attempt in range(2):
+            # Add new labels by ID
+            new_label_ids = kept_label_ids + [
+                label_map[name] for name in required_label_names if name in label_map
+            ]
+            labels_payload = {'labels': new_label_ids}
+            response = session.put(labels_url, headers=headers, json=labels_payload)
+            response.raise_for_status()
+
+            applied = {label['name'] for label in response.json() or []}
+            missing = [name for name in required_label_names if name not in applied]
+            if not missing:
+                break
+            if attempt:
+                raise RuntimeError(f"Forgejo did not apply labels to issue #{issue_number}: {', '.join(missing)}")
+
+            invalidate_label_map(base_url, repo_name)
+            # Update in place so the rest of a batch sharing this map uses the fresh IDs
+            label_map.update(ensure_labels_exist(base_url, headers, repo_name, required_label_names))
+
+    # Prepare issue update payload
+    update_payload = {}
+
+    # Update title if provided
+    if title is not None:
+        update_payload['title'] = title
+
+    # Update body if provided
+    if body is not None:
+        update_payload['body'] = body
+
+    # Close issue if requested
+    if close:
+        update_payload['state'] = 'closed'
+
+    # The PATCH response is the updated issue (labels included); without a
+    # PATCH, fetch it to pick up the new labels and updated_at
+    if update_payload:
+        response = session.patch(api_url, headers=headers, json=update_payload)
+    else:
+        response = session.get(api_url, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+def format_result(issue, repo_name):
+    """Build the JSON printed for an updated issue."""
+    # Extract status from status:* label, fallback to state
+    labels = [label['name'] for label in issue.get('labels', [])]
+    status_value = None
+    for label in labels:
+        if label.startswith('status:'):
+            status_value = label.split(':', 1)[1]
+            break
+
+    # If no status label, derive from Forgejo state
+    if not status_value:
+        status_value = "open" if issue['state'] == "open" else "closed"
+
+    return {
+        "id": str(issue['number']),
+        "system": "forgejo",
+        "type": "issue",
+        "title": issue['title'],
+        "description": issue['body'] or "",
+        "status": status_value,
+        "url": issue['html_url'],
+        "createdAt": issue['created_at'],
+        "updatedAt": issue['updated_at'],
+        "labels": labels,
+        "assignees": [assignee['login'] for assignee in (issue.get('assignees') or [])],
+        "systemData": {
+            "repo": repo_name,
+            "number": issue['number'],
+            "state": issue['state']
+        }
+    }
 
-def get_forgejo_url():
-    """Get Forgejo base URL from environment or git remote."""
-    # First check environment variable
-    if os.environ.get('FORGEJO_URL'):
-        return os.environ['FORGEJO_URL'].rstrip('/')
+def error_message(e):
+    """Describe a failure, including the API's response body when there is one."""
+    error_msg = str(e)
+    if isinstance(e, requests.exceptions.RequestException) and e.response is not None:
+        error_msg = f"{error_msg}: {e.response.text}"
+    return error_msg
 
-    # Try to extract from git remote
+def cache_issues(issues, repo_name):
+    """Write updated issues straight into the cache."""
     try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        remote_url = result.stdout.strip()
-
-        # Parse URL to extract base domain
-        # Handle both SSH and HTTPS URLs
-        if remote_url.startswith('ssh://git@'):
-            # SSH format: ssh://git@forgejo.example.com/owner/repo.git
-            host = remote_url.replace('ssh://git@', '').split('/')[0]
-            return f"https://{host}"
-        elif remote_url.startswith('git@'):
-            # SSH format: git@forgejo.example.com:owner/repo.git
-            host = remote_url.split('@')[1].split(':')[0]
-            return f"https://{host}"
-        elif remote_url.startswith('http'):
-            # HTTPS format: https://forgejo.example.com/owner/repo.git
-            from urllib.parse import urlparse
-            parsed = urlparse(remote_url)
-            return f"{parsed.scheme}://{parsed.netloc}"
-    except Exception:
-        pass
-
-    print(json.dumps({"error": "FORGEJO_URL environment variable not set and could not detect from git remote"}), file=sys.stderr)
-    sys.exit(1)
+        with item_store.open_store() as conn:
+            for issue in issues:
+                item_store.write_item(conn, normalize_issue(issue, repo_name))
+    except Exception as e:
+        # Don't fail the update if caching fails
+        print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
 
 def update_issue(repo_name, issue_number, status=None, priority=None, close=False, cancel=False, title=None, body=None):
     """Update a Forgejo issue's status, priority, state, title, or body."""
-    token = os.environ.get('FORGEJO_TOKEN')
-    if not token:
-        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
-        sys.exit(1)
-
+    token = get_token()
     base_url = get_forgejo_url()
 
     try:
-        headers = {
-            'Authorization': f'token {token}',
-            'Content-Type': 'application/json'
-        }
-
-        # Get current issue state
-        api_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}"
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        issue = response.json()
+        headers = get_headers(token)
+        issue = apply_update(base_url, headers, repo_name, issue_number, status, priority, close, cancel, title, body)
 
-        # Check if it's a pull request
-        if issue.get('pull_request'):
-            print(json.dumps({"error": f"Issue #{issue_number} is a pull request, not an issue"}), file=sys.stderr)
-            return 1
+        cache_issues([issue], repo_name)
 
-        # Get current labels (as IDs)
-        current_label_ids = [label['id'] for label in issue.get('labels', [])]
-        current_label_names = [label['name'] for label in issue.get('labels', [])]
-
-        # Handle cancel (sets status:canceled and closes)
-        if cancel:
-            status = "canceled"
-            close = True
-
-        # Handle close without explicit status (defaults to done)
-        if close and not status:
-            status = "done"
-
-        # Determine which labels we need to add
-        required_label_names = []
-
-        # Add new status label
-        if status:
-            if status not in VALID_STATUSES:
-                print(json.dumps({"error": f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}"}), file=sys.stderr)
-                return 1
-            label_name = f"status:{status}"
-            required_label_names.append(label_name)
-
-        # Add new priority label
-        if priority:
-            if priority not in VALID_PRIORITIES:
-                print(json.dumps({"error": f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}"}), file=sys.stderr)
-                return 1
-            label_name = f"priority:{priority}"
-            required_label_names.append(label_name)
-
-        # Ensure required labels exist in the repository and get their IDs
-        label_map = ensure_labels_exist(base_url, headers, repo_name, required_label_names)
-
-        # Build new label ID list
-        new_label_ids = []
-        for label_id, label_name in zip(current_label_ids, current_label_names):
-            # Remove old status label only if setting new status
-            if label_name.startswith('status:') and status:
-                continue
-            # Remove old priority label only if setting new priority
-            if label_name.startswith('priority:') and priority:
-                continue
-            # Keep all other labels
-            new_label_ids.append(label_id)
-
-        # Add new labels by ID
-        for label_name in required_label_names:
-            if label_name in label_map:
-                new_label_ids.append(label_map[label_name])
-
-        # Update labels using dedicated labels endpoint
-        if new_label_ids or status or priority:
-            labels_url = f"{api_url}/labels"
-            labels_payload = {'labels': new_label_ids}
-            response = requests.put(labels_url, headers=headers, json=labels_payload)
-            response.raise_for_status()
-
-        # Prepare issue update payload
-        update_payload = {}
+        print(json.dumps(format_result(issue, repo_name), indent=2))
+        return 0
 
-        # Update title if provided
-        if title is not None:
-            update_payload['title'] = title
+    except Exception as e:
+        print(json.dumps({"error": error_message(e)}), file=sys.stderr)
+        return 1
 
-        # Update body if provided
-        if body is not None:
-            update_payload['body'] = body
+def bulk_update(repo_name, operations, concurrency=DEFAULT_CONCURRENCY):
+    """Apply many issue updates concurrently over one session and report each one."""
+    token = get_token()
+    base_url = get_forgejo_url()
+    headers = get_headers(token)
 
-        # Close issue if requested
-        if close:
-            update_payload['state'] = 'closed'
+    # Size the shared session's pool for the batch before anything else creates it
+    get_session(pool_size=max(concurrency, 1))
 
-        # Apply updates if any
-        if update_payload:
-            response = requests.patch(api_url, headers=headers, json=update_payload)
-            response.raise_for_status()
+    # Look the standard labels up (and create missing ones) once for the batch
+    label_map = ensure_labels_exist(
+        base_url, headers, repo_name,
+        [f"status:{s}" for s in VALID_STATUSES] + [f"priority:{p}" for p in VALID_PRIORITIES]
+    )
 
-        # Get updated issue
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        issue = response.json()
-
-        # Extract status from status:* label, fallback to state
-        labels = [label['name'] for label in issue.get('labels', [])]
-        status_value = None
-        for label in labels:
-            if label.startswith('status:'):
-                status_value = label.split(':', 1)[1]
-                break
+    updated = []
 
-        # If no status label, derive from Forgejo state
-        if not status_value:
-            status_value = "open" if issue['state'] == "open" else "closed"
-
-        # Return normalized format
-        result = {
-            "id": str(issue['number']),
-            "system": "forgejo",
-            "type": "issue",
-            "title": issue['title'],
-            "description": issue['body'] or "",
-            "status": status_value,
-            "url": issue['html_url'],
-            "createdAt": issue['created_at'],
-            "updatedAt": issue['updated_at'],
-            "labels": labels,
-            "assignees": [assignee['login'] for assignee in (issue.get('assignees') or [])],
-            "systemData": {
-                "repo": repo_name,
-                "number": issue['number'],
-                "state": issue['state']
-            }
-        }
-
-        # Trigger background sync of the updated issue
+    def apply(operation):
+        unknown = set(operation) - set(UPDATE_FIELDS) - {'issue'}
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        changes = {field: operation[field] for field in UPDATE_FIELDS if field in operation}
         try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-issues.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--repo", repo_name, "--issue", str(issue['number'])],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
-        except Exception as e:
-            # Don't fail update if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+            issue = apply_update(base_url, headers, repo_name, int(operation['issue']), label_map=label_map, **changes)
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(error_message(e))
+        updated.append(issue)
+        return format_result(issue, repo_name)
 
-        print(json.dumps(result, indent=2))
-        return 0
+    reports = run_operations(operations, apply, 'issue', concurrency)
+    cache_issues(updated, repo_name)
 
-    except requests.exceptions.RequestException as e:
-        error_msg = str(e)
-        if hasattr(e, 'response') and e.response is not None:
-            error_msg = f"{error_msg}: {e.response.text}"
-        print(json.dumps({"error": error_msg}), file=sys.stderr)
-        return 1
-    except Exception as e:
-        print(json.dumps({"error": str(e)}), file=sys.stderr)
-        return 1
+    summary = summarize(reports)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
 
 def main():
     parser = argparse.ArgumentParser(description='Update a Forgejo issue status, priority, state, title, or body')
     parser.add_argument('--repo', required=True, help='Repository in owner/name format')
-    parser.add_argument('--issue', type=int, required=True, help='Issue number to update')
+    parser.add_argument('--issue', type=int, help='Issue number to update')
+    parser.add_argument('--issues', help='Comma-separated issue numbers to apply the same update to (e.g., 12,15,31)')
+    parser.add_argument('--ops-file', help='JSONL file with one update per line (e.g., {"issue": 12, "status": "done"})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum updates in flight for --issues/--ops-file (default: {DEFAULT_CONCURRENCY})')
     parser.add_argument('--status', choices=VALID_STATUSES, help='Set issue status')
     parser.add_argument('--priority', choices=VALID_PRIORITIES, help='Set issue priority')
     parser.add_argument('--close', action='store_true', help='Close issue (sets status:done)')
@@ -239,14 +278,46 @@ def main():
 
     args = parser.parse_args()
 
-    # Validate that at least one update is requested
-    if not any([args.status, args.priority, args.close, args.cancel, args.title, args.body]):
-        parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
-
     # Validate --close and --cancel are mutually exclusive
     if args.close and args.cancel:
         parser.error("Cannot specify both --close and --cancel")
 
+    has_update = any([args.status, args.priority, args.close, args.cancel, args.title, args.body])
+
+    if args.issues or args.ops_file:
+        if args.issue:
+            parser.error("--issue cannot be combined with --issues or --ops-file")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        # --ops-file lines carry their own changes; listed IDs only get the flags
+        if args.issues and not has_update:
+            parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
+
+        issues = parse_ids(args.issues) if args.issues else []
+        if not all(number.isdigit() for number in issues):
+            parser.error("--issues must be comma-separated issue numbers")
+
+        try:
+            operations = load_operations(
+                'issue',
+                [int(number) for number in issues],
+                args.ops_file,
+                {'status': args.status, 'priority': args.priority, 'close': args.close,
+                 'cancel': args.cancel, 'title': args.title, 'body': args.body}
+            )
+        except (OSError, ValueError) as e:
+            print(json.dumps({"error": str(e)}), file=sys.stderr)
+            return 1
+
+        return bulk_update(args.repo, operations, args.concurrency)
+
+    if not args.issue:
+        parser.error("Must specify --issue, --issues or --ops-file")
+
+    # Validate that at least one update is requested
+    if not has_update:
+        parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
+
     return update_issue(args.repo, args.issue, args.status, args.priority, args.close, args.cancel, args.title, args.body)
 
 if __name__ == '__main__':
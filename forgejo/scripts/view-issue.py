@@ -8,57 +8,15 @@
 
 import argparse
 import json
-import os
 import sys
-import subprocess
 from datetime import datetime
+from pathlib import Path
 import requests
 
-def get_forgejo_url(cwd=None):
-    """Get Forgejo base URL from git remote in cwd."""
-    # Try to extract from git remote in the current directory
-    try:
-        result = subprocess.run(
-            ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=cwd
-        )
-        remote_url = result.stdout.strip()
-
-        # Parse URL to extract base domain
-        # Handle both SSH and HTTPS URLs
-        if remote_url.startswith('git@'):
-            # SSH format: git@forgejo.example.com:owner/repo.git
-            host = remote_url.split('@')[1].split(':')[0]
-            base_url = f"https://{host}"
-        elif remote_url.startswith('http'):
-            # HTTPS format: https://forgejo.example.com/owner/repo.git
-            from urllib.parse import urlparse
-            parsed = urlparse(remote_url)
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-        else:
-            base_url = None
-
-        # Reject github.com
-        if base_url and 'github.com' in base_url:
-            print(json.dumps({
-                "error": "This appears to be a GitHub repository, not Forgejo",
-                "help": "Use the github plugin for GitHub repositories"
-            }), file=sys.stderr)
-            sys.exit(1)
-
-        if base_url:
-            return base_url
-    except Exception:
-        pass
-
-    print(json.dumps({
-        "error": "Could not detect Forgejo URL from git remote",
-        "help": "Make sure you are in a git repository with a Forgejo remote"
-    }), file=sys.stderr)
-    sys.exit(1)
+# Import shared Forgejo client
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+from forgejo_client import get_forgejo_url, get_token, get_headers, get_session
 
 def format_issue_markdown(issue, comments, repo_name):
     """Format issue and comments as markdown."""
@@ -112,22 +70,17 @@ def format_issue_markdown(issue, comments, repo_name):
 
 def view_issue(repo_name, issue_number):
     """Fetch and display issue with all comments."""
-    token = os.environ.get('FORGEJO_TOKEN')
-    if not token:
-        print(json.dumps({"error": "FORGEJO_TOKEN environment variable not set"}), file=sys.stderr)
-        sys.exit(1)
+    token = get_token()
+    session = get_session()
 
     base_url = get_forgejo_url()
 
     try:
-        headers = {
-            'Authorization': f'token {token}',
-            'Content-Type': 'application/json'
-        }
+        headers = get_headers(token)
 
         # Fetch issue
         issue_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}"
-        response = requests.get(issue_url, headers=headers)
+        response = session.get(issue_url, headers=headers)
         response.raise_for_status()
         issue = response.json()
 
@@ -138,7 +91,7 @@ def view_issue(repo_name, issue_number):
 
         # Fetch all comments
         comments_url = f"{base_url}/api/v1/repos/{repo_name}/issues/{issue_number}/comments"
-        response = requests.get(comments_url, headers=headers)
+        response = session.get(comments_url, headers=headers)
         response.raise_for_status()
         comments = response.json()
 
@@ -10,8 +10,14 @@ import argparse
 import json
 import os
 import sys
+from pathlib import Path
 from github import Github, Auth
 
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+
 def create_comment(repo_name, issue_number, body):
     """Create a comment on a GitHub issue and return JSON."""
     token = os.environ.get('GITHUB_TOKEN')
@@ -40,6 +46,17 @@ def create_comment(repo_name, issue_number, body):
             "repo": repo_name
         }
 
+        # A comment bumps the issue's updatedAt; refresh the cached copy
+        try:
+            with item_store.open_store() as conn:
+                key = item_store.item_key({'system': 'github', 'id': str(issue_number), 'systemData': {'repo': repo_name}})
+                cached = item_store.get_item(conn, key)
+                if cached:
+                    item_store.write_item(conn, {**cached, 'updatedAt': result['updated_at']})
+        except Exception as e:
+            # Don't fail the comment if caching fails
+            print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
+
         print(json.dumps(result, indent=2))
         return 0
 
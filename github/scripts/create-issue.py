@@ -2,19 +2,33 @@
 # /// script
 # dependencies = [
 #   "PyGithub>=2.1.1",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
 
 import argparse
+import importlib.util
 import json
 import os
 import sys
-import subprocess
 from datetime import datetime
 from pathlib import Path
 from github import Github, Auth
 
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-issues.py"
+_spec = importlib.util.spec_from_file_location("github_sync_issues", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_issue = _sync.normalize_issue
+
 def create_issue(repo_name, title, body, labels=None):
     """Create a GitHub issue and return normalized JSON."""
     token = os.environ.get('GITHUB_TOKEN')
@@ -53,20 +67,13 @@ def create_issue(repo_name, title, body, labels=None):
             }
         }
 
-        # Trigger background sync of the newly created issue
+        # Write the newly created issue straight into the cache
         try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-issues.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--repo", repo_name, "--issue", str(issue.number)],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
+            with item_store.open_store() as conn:
+                item_store.write_item(conn, normalize_issue(issue, repo_name))
         except Exception as e:
-            # Don't fail issue creation if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+            # Don't fail issue creation if caching fails
+            print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
 
         print(json.dumps(result, indent=2))
         return 0
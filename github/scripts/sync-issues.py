@@ -2,6 +2,7 @@
 # /// script
 # dependencies = [
 #   "PyGithub>=2.1.1",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
@@ -12,16 +13,63 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
-from github import Github, Auth
+from types import SimpleNamespace
+import requests
+from github import Github, Auth, GithubRetry
 
 # Add path to core scripts for sync_manager
 core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
 sys.path.insert(0, str(core_scripts_path))
-from sync_manager import update_sync_metadata
+from sync_manager import update_sync_metadata, get_sync_cursor, listing_cursor, load_checkpoint, save_checkpoint, clear_checkpoint
+import item_store
+from retry import DEFAULT_ATTEMPTS, call_with_retry
+from http_validators import load_validators, save_validators, validator_key, conditional_headers, response_validators
 
 CACHE_DIR = Path.home() / ".local" / "todu" / "github"
 ITEMS_DIR = Path.home() / ".local" / "todu" / "issues"
 
+GRAPHQL_URL = "https://api.github.com/graphql"
+REST_URL = "https://api.github.com"
+
+# Issues per REST page
+PAGE_SIZE = 100
+
+# Only the fields normalize_issue() reads; the issues connection never
+# includes pull requests
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $after: String, $since: DateTime) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $after, filterBy: {since: $since}, orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        title
+        body
+        state
+        stateReason
+        url
+        createdAt
+        updatedAt
+        closedAt
+        labels(first: 100) {
+          nodes {
+            name
+          }
+        }
+        assignees(first: 100) {
+          nodes {
+            login
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
 def normalize_issue(issue, repo_name):
     """Convert GitHub issue to normalized format."""
     # Extract label names first
@@ -83,7 +131,136 @@ def normalize_issue(issue, repo_name):
 
     return normalized
 
-def sync_issues(repo_name, since=None, issue_number=None):
+def parse_graphql_datetime(value):
+    """Parse a GraphQL/REST ISO 8601 timestamp, or None."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')) if value else None
+
+def graphql_issue(node):
+    """Adapt a GraphQL issue node to the attributes normalize_issue() reads."""
+    return SimpleNamespace(
+        number=node['number'],
+        title=node['title'],
+        body=node['body'],
+        state=node['state'].lower(),
+        state_reason=node['stateReason'].lower() if node.get('stateReason') else None,
+        html_url=node['url'],
+        created_at=parse_graphql_datetime(node['createdAt']),
+        updated_at=parse_graphql_datetime(node['updatedAt']),
+        closed_at=parse_graphql_datetime(node.get('closedAt')),
+        labels=[SimpleNamespace(name=label['name']) for label in node['labels']['nodes']],
+        assignees=[SimpleNamespace(login=assignee['login']) for assignee in node['assignees']['nodes']],
+        pull_request=None
+    )
+
+def rest_issue(data):
+    """Adapt a REST/webhook issue payload to the attributes normalize_issue() reads."""
+    return SimpleNamespace(
+        number=data['number'],
+        title=data['title'],
+        body=data.get('body'),
+        state=data['state'],
+        state_reason=data.get('state_reason'),
+        html_url=data['html_url'],
+        created_at=parse_graphql_datetime(data['created_at']),
+        updated_at=parse_graphql_datetime(data['updated_at']),
+        closed_at=parse_graphql_datetime(data.get('closed_at')),
+        labels=[SimpleNamespace(name=label['name']) for label in data.get('labels') or []],
+        assignees=[SimpleNamespace(login=assignee['login']) for assignee in data.get('assignees') or []],
+        pull_request=data.get('pull_request')
+    )
+
+def fetch_rest_pages(repo, since=None, page=0):
+    """
+    Yield (page number, issues) from the REST API, starting at page (0-based).
+
+    Issues are listed oldest created first: unlike the update order, an
+    update doesn't move an issue to another page while the pages are read.
+    """
+    params = {'state': 'all', 'sort': 'created', 'direction': 'asc'}
+    if since:
+        params['since'] = since
+    issues = repo.get_issues(**params)
+
+    while True:
+        page_issues = issues.get_page(page)
+        if not page_issues:
+            return
+        yield page, page_issues
+        if len(page_issues) < PAGE_SIZE:
+            return
+        page += 1
+
+def fetch_graphql_pages(token, repo_name, since=None, after=None):
+    """
+    Yield (end cursor, issues) from the GraphQL API, 100 issues (no pull
+    requests) per request, starting after the given end cursor.
+    """
+    owner, name = repo_name.split('/', 1)
+    variables = {
+        "owner": owner,
+        "name": name,
+        "after": after,
+        "since": since.isoformat() if since else None
+    }
+
+    with requests.Session() as session:
+        session.headers['Authorization'] = f'bearer {token}'
+        while True:
+            # Queries are safe to repeat after a server error
+            response = call_with_retry(
+                lambda: session.post(GRAPHQL_URL, json={"query": ISSUES_QUERY, "variables": variables})
+            )
+            response.raise_for_status()
+            payload = response.json()
+
+            if payload.get('errors'):
+                raise RuntimeError("; ".join(error.get('message', str(error)) for error in payload['errors']))
+
+            repository = payload['data']['repository']
+            if repository is None:
+                raise RuntimeError(f"Repository {repo_name} not found")
+
+            connection = repository['issues']
+            yield connection['pageInfo']['endCursor'], [graphql_issue(node) for node in connection['nodes']]
+
+            if not connection['pageInfo']['hasNextPage']:
+                return
+            variables['after'] = connection['pageInfo']['endCursor']
+
+def probe_issues(token, repo_name):
+    """
+    Check with a conditional request whether a repo's issues changed.
+
+    Requests only the most recently updated issue or pull request, sending the
+    validators stored by the last completed sync. Any create or update moves
+    a new item to the top and changes the response, so a 304 means nothing
+    changed since that sync; GitHub doesn't count a 304 against the rate limit.
+
+    Returns:
+        Tuple of (True if not modified, validator key, new validator entry or None)
+    """
+    api_url = f"{REST_URL}/repos/{repo_name}/issues"
+    params = {
+        'state': 'all',
+        'sort': 'updated',
+        'direction': 'desc',
+        'per_page': 1
+    }
+    key = validator_key(api_url, params)
+
+    headers = {
+        'Authorization': f'bearer {token}',
+        'Accept': 'application/vnd.github+json',
+        **conditional_headers(load_validators().get(key))
+    }
+    response = call_with_retry(lambda: requests.get(api_url, headers=headers, params=params))
+    if response.status_code == 304:
+        return True, key, None
+    response.raise_for_status()
+
+    return False, key, response_validators(response.headers)
+
+def sync_issues(repo_name, since=None, issue_number=None, full=False, graphql=False, resume=False):
     """Sync GitHub issues to local cache."""
     token = os.environ.get('GITHUB_TOKEN')
     if not token:
@@ -91,74 +268,135 @@ def sync_issues(repo_name, since=None, issue_number=None):
         sys.exit(1)
 
     try:
-        gh = Github(auth=Auth.Token(token))
-        repo = gh.get_repo(repo_name)
-
         # Create cache directories
         ITEMS_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Use repo name prefix in filename to avoid conflicts
-        # Replace '/' with '_' for valid filename
-        repo_prefix = repo_name.replace('/', '_')
+        # An explicit --since asks for a listing; only cursor-driven syncs probe
+        explicit_since = since is not None
+
+        # Continue an interrupted listing from its checkpoint
+        checkpoint = load_checkpoint("github", repo_name) if resume else None
+        if checkpoint:
+            since = datetime.fromisoformat(checkpoint['since']) if checkpoint.get('since') else None
+
+        # A resumed listing keeps the original start, so issues that changed
+        # on already-written pages before the resume are caught next time
+        started_at = datetime.now(timezone.utc)
+        if checkpoint and checkpoint.get('startedAt'):
+            started_at = datetime.fromisoformat(checkpoint['startedAt'])
+
+        # Default to incremental from this repo's cursor unless a full sync is requested
+        if not since and not issue_number and not full and not checkpoint:
+            cursor = get_sync_cursor("github", repo_name)
+            if cursor:
+                since = datetime.fromisoformat(cursor)
+
+        # Conditional probe result, saved once the sync completes
+        probe_key = probe_entry = None
+        not_modified = False
 
         # Fetch issues based on mode
         if issue_number:
             # Single issue mode
+            repo = Github(auth=Auth.Token(token), retry=GithubRetry(total=DEFAULT_ATTEMPTS)).get_repo(repo_name)
             issue = repo.get_issue(issue_number)
             if issue.pull_request:
                 print(json.dumps({"error": f"Issue #{issue_number} is a pull request, not an issue"}), file=sys.stderr)
                 return 1
-            issues = [issue]
+            pages = iter([(None, [issue])])
             sync_mode = "single"
-        elif since:
-            # Incremental sync mode
-            issues = repo.get_issues(state='all', since=since)
-            sync_mode = "incremental"
         else:
-            # Full sync mode
-            issues = repo.get_issues(state='all')
-            sync_mode = "full"
-
-        new_count = 0
-        updated_count = 0
-
-        for issue in issues:
-            # Skip pull requests
-            if issue.pull_request:
-                continue
-
-            # Use system and repo prefix in filename to avoid conflicts
-            issue_file = ITEMS_DIR / f"github-{repo_prefix}-{issue.number}.json"
-            is_new = not issue_file.exists()
+            sync_mode = "incremental" if since else "full"
 
-            # Save normalized issue
-            normalized = normalize_issue(issue, repo_name)
-            with open(issue_file, 'w') as f:
-                json.dump(normalized, f, indent=2)
+            # Conditional probe: skip the listing when nothing changed (--full always lists)
+            if not full and not checkpoint and not explicit_since:
+                not_modified, probe_key, probe_entry = probe_issues(token, repo_name)
 
-            if is_new:
-                new_count += 1
+            if not_modified:
+                pages = iter([])
+            elif graphql:
+                # Issues only, with just the fields we normalize
+                pages = fetch_graphql_pages(token, repo_name, since, (checkpoint or {}).get('after'))
             else:
-                updated_count += 1
+                repo = Github(auth=Auth.Token(token), retry=GithubRetry(total=DEFAULT_ATTEMPTS), per_page=PAGE_SIZE).get_repo(repo_name)
+                # Re-read the last written page: a deleted or transferred
+                # issue shifts later issues back by one
+                pages = fetch_rest_pages(repo, since, (checkpoint or {}).get('page', 0))
+
+        new_count = 0
+        updated_count = 0
+        unchanged_count = 0
+
+        # Each page is committed once written, so written pages survive a
+        # later failure
+        with item_store.open_store() as conn:
+            for position, page_issues in pages:
+                for issue in page_issues:
+                    # Skip pull requests
+                    if issue.pull_request:
+                        continue
+
+                    # Save normalized issue (skipped when its content hash is unchanged)
+                    normalized = normalize_issue(issue, repo_name)
+                    outcome = item_store.write_item(conn, normalized)
+                    if outcome == 'new':
+                        new_count += 1
+                    elif outcome == 'updated':
+                        updated_count += 1
+                    else:
+                        unchanged_count += 1
+
+                conn.commit()
+
+                # Record progress so --resume can continue after this page
+                if sync_mode != "single":
+                    save_checkpoint("github", repo_name, {
+                        "since": since.isoformat() if since else None,
+                        "startedAt": started_at.isoformat(),
+                        ("after" if graphql else "page"): position
+                    })
+
+        # Only a complete listing may advance the cursor; a single issue could
+        # be newer than others that were not fetched
+        cursor = listing_cursor(started_at) if sync_mode != "single" else None
+
+        if probe_entry:
+            save_validators({probe_key: probe_entry})
+        if sync_mode != "single":
+            clear_checkpoint("github", repo_name)
 
         # Update sync metadata in unified file
         update_sync_metadata(
             system="github",
             mode=sync_mode,
-            task_count=new_count + updated_count
+            repo=repo_name,
+            cursor=cursor,
+            task_count=new_count + updated_count + unchanged_count,
+            stats={
+                "new": new_count,
+                "updated": updated_count,
+                "unchanged": unchanged_count,
+                "total": new_count + updated_count + unchanged_count
+            }
         )
 
         result = {
-            "synced": new_count + updated_count,
+            "synced": new_count + updated_count + unchanged_count,
             "new": new_count,
             "updated": updated_count,
+            "unchanged": unchanged_count,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "mode": sync_mode
         }
 
+        if not_modified:
+            result["notModified"] = True
+
         # Add issue number for single issue sync
         if issue_number:
             result["issue"] = f"#{issue_number}"
+        elif since:
+            result["since"] = since.isoformat()
 
         print(json.dumps(result, indent=2))
         return 0
@@ -176,18 +414,27 @@ def sync_issues(repo_name, since=None, issue_number=None):
 def main():
     parser = argparse.ArgumentParser(description='Sync GitHub issues to local cache')
     parser.add_argument('--repo', required=True, help='Repository in owner/name format')
-    parser.add_argument('--since', help='ISO timestamp to fetch issues since')
+    parser.add_argument('--since', help='ISO timestamp to fetch issues since (default: last sync cursor for this repo)')
     parser.add_argument('--issue', type=int, help='Sync specific issue number')
+    parser.add_argument('--full', action='store_true', help='Fetch all issues, ignoring the incremental sync cursor')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted sync from its checkpoint')
+    parser.add_argument('--graphql', action='store_true', help='Fetch issues through the GraphQL API (issues only, fewer requests)')
 
     args = parser.parse_args()
 
-    # Make --issue and --since mutually exclusive
-    if args.issue and args.since:
-        parser.error("Cannot specify both --issue and --since")
+    # Make --issue, --since and --full mutually exclusive
+    if sum(bool(x) for x in [args.issue, args.since, args.full]) > 1:
+        parser.error("Only one of --issue, --since or --full can be specified")
+
+    if args.graphql and args.issue:
+        parser.error("--graphql cannot be combined with --issue")
+
+    if args.resume and (args.issue or args.since):
+        parser.error("--resume cannot be combined with --issue or --since")
 
     since = datetime.fromisoformat(args.since.replace('Z', '+00:00')) if args.since else None
 
-    return sync_issues(args.repo, since, args.issue)
+    return sync_issues(args.repo, since, args.issue, args.full, args.graphql, args.resume)
 
 if __name__ == '__main__':
     sys.exit(main())
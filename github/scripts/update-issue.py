@@ -2,148 +2,211 @@
 # /// script
 # dependencies = [
 #   "PyGithub>=2.1.1",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
 
 import argparse
+import importlib.util
 import json
 import os
 import sys
-import subprocess
 from pathlib import Path
 from github import Github, Auth
 
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+from bulk_ops import DEFAULT_CONCURRENCY, parse_ids, load_operations, run_operations, summarize
+
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-issues.py"
+_spec = importlib.util.spec_from_file_location("github_sync_issues", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_issue = _sync.normalize_issue
+
 # Valid status and priority values
 VALID_STATUSES = ["backlog", "in-progress", "done", "canceled"]
 VALID_PRIORITIES = ["low", "medium", "high"]
 
-def update_issue(repo_name, issue_number, status=None, priority=None, close=False, cancel=False, title=None, body=None):
-    """Update a GitHub issue's status, priority, state, title, or body."""
+# Fields an --ops-file line may set besides "issue"
+UPDATE_FIELDS = ["status", "priority", "close", "cancel", "title", "body"]
+
+def get_token():
+    """Get the GitHub token from GITHUB_TOKEN, exiting if it is not set."""
     token = os.environ.get('GITHUB_TOKEN')
     if not token:
         print(json.dumps({"error": "GITHUB_TOKEN environment variable not set"}), file=sys.stderr)
         sys.exit(1)
+    return token
+
+def apply_update(repo, issue_number, status=None, priority=None, close=False, cancel=False, title=None, body=None):
+    """
+    Apply one update to a GitHub issue and return the updated issue.
+
+    Labels, title, body and state go out in a single PATCH, whose response
+    refreshes the issue object, so no follow-up GET is needed.
+
+    Raises:
+        ValueError: If the update is invalid or the issue is a pull request
+    """
+    # Validate before touching the issue
+    if not any([status, priority, close, cancel, title is not None, body is not None]):
+        raise ValueError("Must specify at least one of: status, priority, close, cancel, title, or body")
+    if close and cancel:
+        raise ValueError("Cannot specify both close and cancel")
+    if status and status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}")
+    if priority and priority not in VALID_PRIORITIES:
+        raise ValueError(f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}")
+
+    issue = repo.get_issue(issue_number)
+
+    # Check if it's a pull request
+    if issue.pull_request:
+        raise ValueError(f"Issue #{issue_number} is a pull request, not an issue")
+
+    # Get current labels
+    current_labels = [label.name for label in issue.labels]
+
+    # Handle cancel (sets status:canceled and closes)
+    if cancel:
+        status = "canceled"
+        close = True
+
+    # Handle close without explicit status (defaults to done)
+    if close and not status:
+        status = "done"
+
+    # Build new label list
+    new_labels = []
+    for label in current_labels:
+        # Remove old status label only if setting new status
+        if label.startswith('status:') and status:
+            continue
+        # Remove old priority label only if setting new priority
+        if label.startswith('priority:') and priority:
+            continue
+        # Keep all other labels
+        new_labels.append(label)
+
+    # Add new status label
+    if status:
+        new_labels.append(f"status:{status}")
+
+    # Add new priority label
+    if priority:
+        new_labels.append(f"priority:{priority}")
+
+    # Prepare edit parameters
+    edit_params = {'labels': new_labels}
+
+    # Update title if provided
+    if title is not None:
+        edit_params['title'] = title
+
+    # Update body if provided
+    if body is not None:
+        edit_params['body'] = body
+
+    # Close issue if requested
+    if close:
+        edit_params['state'] = 'closed'
+
+    issue.edit(**edit_params)
+    return issue
+
+def format_result(issue, repo_name):
+    """Build the JSON printed for an updated issue."""
+    return {
+        "id": str(issue.number),
+        "system": "github",
+        "type": "issue",
+        "title": issue.title,
+        "description": issue.body or "",
+        "status": "open" if issue.state == "open" else "closed",
+        "url": issue.html_url,
+        "createdAt": issue.created_at.isoformat(),
+        "updatedAt": issue.updated_at.isoformat(),
+        "labels": [label.name for label in issue.labels],
+        "assignees": [assignee.login for assignee in issue.assignees],
+        "systemData": {
+            "repo": repo_name,
+            "number": issue.number,
+            "state": issue.state
+        }
+    }
+
+def cache_issues(issues, repo_name):
+    """Write updated issues straight into the cache."""
+    try:
+        with item_store.open_store() as conn:
+            for issue in issues:
+                item_store.write_item(conn, normalize_issue(issue, repo_name))
+    except Exception as e:
+        # Don't fail the update if caching fails
+        print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
+
+def update_issue(repo_name, issue_number, status=None, priority=None, close=False, cancel=False, title=None, body=None):
+    """Update a GitHub issue's status, priority, state, title, or body."""
+    token = get_token()
 
     try:
         gh = Github(auth=Auth.Token(token))
         repo = gh.get_repo(repo_name)
-        issue = repo.get_issue(issue_number)
+        issue = apply_update(repo, issue_number, status, priority, close, cancel, title, body)
 
-        # Check if it's a pull request
-        if issue.pull_request:
-            print(json.dumps({"error": f"Issue #{issue_number} is a pull request, not an issue"}), file=sys.stderr)
-            return 1
+        cache_issues([issue], repo_name)
 
-        # Get current labels
-        current_labels = [label.name for label in issue.labels]
-
-        # Handle cancel (sets status:canceled and closes)
-        if cancel:
-            status = "canceled"
-            close = True
-
-        # Handle close without explicit status (defaults to done)
-        if close and not status:
-            status = "done"
-
-        # Build new label list
-        new_labels = []
-        for label in current_labels:
-            # Remove old status label only if setting new status
-            if label.startswith('status:') and status:
-                continue
-            # Remove old priority label only if setting new priority
-            if label.startswith('priority:') and priority:
-                continue
-            # Keep all other labels
-            new_labels.append(label)
-
-        # Add new status label
-        if status:
-            if status not in VALID_STATUSES:
-                print(json.dumps({"error": f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}"}), file=sys.stderr)
-                return 1
-            new_labels.append(f"status:{status}")
-
-        # Add new priority label
-        if priority:
-            if priority not in VALID_PRIORITIES:
-                print(json.dumps({"error": f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}"}), file=sys.stderr)
-                return 1
-            new_labels.append(f"priority:{priority}")
-
-        # Update labels
-        issue.set_labels(*new_labels)
-
-        # Prepare edit parameters
-        edit_params = {}
-
-        # Update title if provided
-        if title is not None:
-            edit_params['title'] = title
-
-        # Update body if provided
-        if body is not None:
-            edit_params['body'] = body
-
-        # Close issue if requested
-        if close:
-            edit_params['state'] = 'closed'
-
-        # Apply edits if any
-        if edit_params:
-            issue.edit(**edit_params)
-
-        # Refresh issue to get updated state
-        issue = repo.get_issue(issue_number)
-
-        # Return normalized format
-        result = {
-            "id": str(issue.number),
-            "system": "github",
-            "type": "issue",
-            "title": issue.title,
-            "description": issue.body or "",
-            "status": "open" if issue.state == "open" else "closed",
-            "url": issue.html_url,
-            "createdAt": issue.created_at.isoformat(),
-            "updatedAt": issue.updated_at.isoformat(),
-            "labels": [label.name for label in issue.labels],
-            "assignees": [assignee.login for assignee in issue.assignees],
-            "systemData": {
-                "repo": repo_name,
-                "number": issue.number,
-                "state": issue.state
-            }
-        }
+        print(json.dumps(format_result(issue, repo_name), indent=2))
+        return 0
 
-        # Trigger background sync of the updated issue
-        try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-issues.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--repo", repo_name, "--issue", str(issue.number)],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
-        except Exception as e:
-            # Don't fail update if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
 
-        print(json.dumps(result, indent=2))
-        return 0
+def bulk_update(repo_name, operations, concurrency=DEFAULT_CONCURRENCY):
+    """Apply many issue updates concurrently over one client and report each one."""
+    token = get_token()
 
+    try:
+        gh = Github(auth=Auth.Token(token), pool_size=concurrency)
+        # Looked up once for the whole batch
+        repo = gh.get_repo(repo_name)
     except Exception as e:
         print(json.dumps({"error": str(e)}), file=sys.stderr)
         return 1
 
+    updated = []
+
+    def apply(operation):
+        unknown = set(operation) - set(UPDATE_FIELDS) - {'issue'}
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        changes = {field: operation[field] for field in UPDATE_FIELDS if field in operation}
+        issue = apply_update(repo, int(operation['issue']), **changes)
+        updated.append(issue)
+        return format_result(issue, repo_name)
+
+    reports = run_operations(operations, apply, 'issue', concurrency)
+    cache_issues(updated, repo_name)
+
+    summary = summarize(reports)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
+
 def main():
     parser = argparse.ArgumentParser(description='Update a GitHub issue status, priority, state, title, or body')
     parser.add_argument('--repo', required=True, help='Repository in owner/name format')
-    parser.add_argument('--issue', type=int, required=True, help='Issue number to update')
+    parser.add_argument('--issue', type=int, help='Issue number to update')
+    parser.add_argument('--issues', help='Comma-separated issue numbers to apply the same update to (e.g., 12,15,31)')
+    parser.add_argument('--ops-file', help='JSONL file with one update per line (e.g., {"issue": 12, "status": "done"})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum updates in flight for --issues/--ops-file (default: {DEFAULT_CONCURRENCY})')
     parser.add_argument('--status', choices=VALID_STATUSES, help='Set issue status')
     parser.add_argument('--priority', choices=VALID_PRIORITIES, help='Set issue priority')
     parser.add_argument('--close', action='store_true', help='Close issue (sets status:done)')
@@ -153,14 +216,46 @@ def main():
 
     args = parser.parse_args()
 
-    # Validate that at least one update is requested
-    if not any([args.status, args.priority, args.close, args.cancel, args.title, args.body]):
-        parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
-
     # Validate --close and --cancel are mutually exclusive
     if args.close and args.cancel:
         parser.error("Cannot specify both --close and --cancel")
 
+    has_update = any([args.status, args.priority, args.close, args.cancel, args.title, args.body])
+
+    if args.issues or args.ops_file:
+        if args.issue:
+            parser.error("--issue cannot be combined with --issues or --ops-file")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        # --ops-file lines carry their own changes; listed IDs only get the flags
+        if args.issues and not has_update:
+            parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
+
+        issues = parse_ids(args.issues) if args.issues else []
+        if not all(number.isdigit() for number in issues):
+            parser.error("--issues must be comma-separated issue numbers")
+
+        try:
+            operations = load_operations(
+                'issue',
+                [int(number) for number in issues],
+                args.ops_file,
+                {'status': args.status, 'priority': args.priority, 'close': args.close,
+                 'cancel': args.cancel, 'title': args.title, 'body': args.body}
+            )
+        except (OSError, ValueError) as e:
+            print(json.dumps({"error": str(e)}), file=sys.stderr)
+            return 1
+
+        return bulk_update(args.repo, operations, args.concurrency)
+
+    if not args.issue:
+        parser.error("Must specify --issue, --issues or --ops-file")
+
+    # Validate that at least one update is requested
+    if not has_update:
+        parser.error("Must specify at least one of: --status, --priority, --close, --cancel, --title, or --body")
+
     return update_issue(args.repo, args.issue, args.status, args.priority, args.close, args.cancel, args.title, args.body)
 
 if __name__ == '__main__':
@@ -2,19 +2,33 @@
 # /// script
 # dependencies = [
 #   "todoist-api-python>=2.1.0",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
 
 import argparse
+import importlib.util
 import json
 import os
 import sys
-import subprocess
 from datetime import datetime
 from pathlib import Path
 from todoist_api_python.api import TodoistAPI
 
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-tasks.py"
+_spec = importlib.util.spec_from_file_location("todoist_sync_tasks", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_task = _sync.normalize_task
+
 # Priority mapping: Todoist 1-4 to our labels
 PRIORITY_TO_LABEL = {
     4: "priority:high",    # Urgent
@@ -104,20 +118,13 @@ def create_task(title, description=None, project_id=None, priority=None, due_dat
             }
         }
 
-        # Trigger background sync of the newly created task
+        # Write the newly created task straight into the cache
         try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-tasks.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--task-id", task.id],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
+            with item_store.open_store() as conn:
+                item_store.write_item(conn, normalize_task(task))
         except Exception as e:
-            # Don't fail task creation if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+            # Don't fail task creation if caching fails
+            print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
 
         print(json.dumps(result, indent=2))
         return 0
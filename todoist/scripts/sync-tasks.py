@@ -2,6 +2,7 @@
 # /// script
 # dependencies = [
 #   "todoist-api-python>=2.1.0",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
@@ -11,17 +12,31 @@ import json
 import os
 import sys
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import requests
 from todoist_api_python.api import TodoistAPI
+from todoist_api_python.models import Task
 
 # Add path to core scripts for sync_manager
 core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
 sys.path.insert(0, str(core_scripts_path))
-from sync_manager import update_sync_metadata
+from sync_manager import update_sync_metadata, get_sync_cursor
+import item_store
+from retry import call_with_retry, with_retry
 
 CACHE_DIR = Path.home() / ".local" / "todu" / "todoist"
 ITEMS_DIR = Path.home() / ".local" / "todu" / "issues"
 
+SYNC_API_URL = "https://api.todoist.com/api/v1/sync"
+COMPLETED_API_URL = "https://api.todoist.com/api/v1/tasks/completed/by_completion_date"
+
+# Completed-task history: first-run window, and the API's maximum range per request
+DEFAULT_COMPLETED_DAYS = 14
+MAX_COMPLETED_WINDOW = timedelta(days=89)
+
+# Cursor scope for syncs that aren't limited to one project
+ALL_PROJECTS = "all"
+
 # Priority mapping: Todoist 1-4 to our labels
 PRIORITY_TO_LABEL = {
     4: "priority:high",    # Urgent
@@ -34,8 +49,8 @@ def normalize_task(task):
     """Convert Todoist task to normalized format."""
     # Convert Todoist priority to label
     priority_label = PRIORITY_TO_LABEL.get(task.priority)
-    task_labels = task.labels if task.labels else []
-    if priority_label:
+    task_labels = list(task.labels) if task.labels else []
+    if priority_label and priority_label not in task_labels:
         task_labels.append(priority_label)
 
     # Convert datetime objects to ISO format strings
@@ -116,7 +131,140 @@ def normalize_task(task):
 
     return normalized
 
-def sync_tasks(project_id=None, task_id=None):
+def sync_api_task(item):
+    """
+    Load a Sync API or completed-tasks item as the SDK's Task.
+
+    The SDK model accepts both the REST and the Sync API field names, so a
+    task normalizes identically (URL, due date, timestamps) whichever API
+    it came from.
+    """
+    return Task.from_dict(item)
+
+def fetch_changed_items(token, sync_token):
+    """
+    Fetch items changed since sync_token from the Todoist Sync API.
+
+    A sync_token of '*' requests a full sync of all active items.
+
+    Returns:
+        Tuple of (changed item dicts, new sync token)
+    """
+    # A read-only sync is safe to repeat after a server error
+    response = call_with_retry(lambda: requests.post(
+        SYNC_API_URL,
+        headers={'Authorization': f'Bearer {token}'},
+        data={'sync_token': sync_token, 'resource_types': '["items"]'}
+    ))
+    response.raise_for_status()
+    payload = response.json()
+    return payload.get('items', []), payload['sync_token']
+
+def sync_changes(token, project_id=None):
+    """
+    Apply Todoist changes since the stored sync_token to the local cache.
+
+    Changed and completed tasks are written and deleted tasks are removed.
+    For a project sync, tasks from other projects are skipped unless they
+    are already cached (e.g. moved out of the project).
+
+    Returns:
+        Dict of new/updated/unchanged/deleted counts, the sync mode and
+        the new sync token
+    """
+    scope = project_id or ALL_PROJECTS
+    sync_token = get_sync_cursor("todoist", scope)
+    items, next_token = fetch_changed_items(token, sync_token or '*')
+
+    counts = {'new': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+
+    with item_store.open_store() as conn:
+        for item in items:
+            key = item_store.item_key({'system': 'todoist', 'id': item['id']})
+
+            if project_id and item.get('project_id') != project_id:
+                cached = conn.execute("SELECT 1 FROM items WHERE key = ?", (key,)).fetchone()
+                if not cached:
+                    continue
+
+            if item.get('is_deleted'):
+                if item_store.delete_item(conn, key):
+                    counts['deleted'] += 1
+                continue
+
+            # Save normalized task (skipped when its content hash is unchanged)
+            outcome = item_store.write_item(conn, normalize_task(sync_api_task(item)))
+            counts[outcome] += 1
+
+    counts['mode'] = "incremental" if sync_token else "full"
+    counts['cursor'] = next_token
+    return counts
+
+def format_api_datetime(value):
+    """Format a datetime for Todoist API date filters."""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def fetch_completed_items(token, since, until, project_id=None):
+    """
+    Yield tasks completed between since and until, one API page at a time.
+
+    Ranges longer than the API's maximum are split into consecutive windows.
+    """
+    headers = {'Authorization': f'Bearer {token}'}
+    window_start = since
+    while window_start < until:
+        window_end = min(window_start + MAX_COMPLETED_WINDOW, until)
+        params = {
+            'since': format_api_datetime(window_start),
+            'until': format_api_datetime(window_end),
+            'limit': 200
+        }
+        if project_id:
+            params['project_id'] = project_id
+
+        while True:
+            response = call_with_retry(lambda: requests.get(COMPLETED_API_URL, headers=headers, params=params))
+            response.raise_for_status()
+            payload = response.json()
+
+            yield payload.get('items', [])
+
+            if not payload.get('next_cursor'):
+                break
+            params['cursor'] = payload['next_cursor']
+
+        window_start = window_end
+
+def sync_completed(token, project_id=None, days=DEFAULT_COMPLETED_DAYS):
+    """
+    Cache tasks completed since the last completed-history sync.
+
+    The first run covers the last `days` days; later runs continue from the
+    end of the previous window, stored as the cursor for the scope.
+
+    Returns:
+        Dict of new/updated/unchanged counts, the window and the new cursor
+    """
+    scope = f"completed:{project_id or ALL_PROJECTS}"
+    until = datetime.now(timezone.utc)
+    cursor = get_sync_cursor("todoist", scope)
+    since = datetime.fromisoformat(cursor) if cursor else until - timedelta(days=days)
+
+    counts = {'new': 0, 'updated': 0, 'unchanged': 0}
+
+    with item_store.open_store() as conn:
+        for page in fetch_completed_items(token, since, until, project_id):
+            for item in page:
+                # Save normalized task (skipped when its content hash is unchanged)
+                task = sync_api_task(item)
+                outcome = item_store.write_item(conn, normalize_task(task))
+                counts[outcome] += 1
+            conn.commit()
+
+    counts.update({'scope': scope, 'since': since.isoformat(), 'cursor': until.isoformat()})
+    return counts
+
+def sync_tasks(project_id=None, task_id=None, full=False, completed=False, days=DEFAULT_COMPLETED_DAYS):
     """Sync Todoist tasks to local cache."""
     token = os.environ.get('TODOIST_TOKEN')
     if not token:
@@ -124,11 +272,79 @@ def sync_tasks(project_id=None, task_id=None):
         sys.exit(1)
 
     try:
-        api = TodoistAPI(token)
-
         # Create cache directories
         ITEMS_DIR.mkdir(parents=True, exist_ok=True)
 
+        # Completed-task history over a bounded window
+        if completed:
+            counts = sync_completed(token, project_id, days)
+            total = counts['new'] + counts['updated'] + counts['unchanged']
+
+            update_sync_metadata(
+                system="todoist",
+                mode="completed",
+                task_count=total,
+                stats={
+                    "new": counts['new'],
+                    "updated": counts['updated'],
+                    "unchanged": counts['unchanged'],
+                    "total": total
+                },
+                project_id=project_id,
+                repo=counts['scope'],
+                cursor=counts['cursor']
+            )
+
+            result = {
+                "synced": total,
+                "new": counts['new'],
+                "updated": counts['updated'],
+                "unchanged": counts['unchanged'],
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "mode": "completed",
+                "since": counts['since'],
+                "until": counts['cursor']
+            }
+
+            print(json.dumps(result, indent=2))
+            return 0
+
+        # Default: incremental sync of changes since the stored sync_token
+        if not task_id and not full:
+            counts = sync_changes(token, project_id)
+            total = counts['new'] + counts['updated'] + counts['unchanged']
+
+            update_sync_metadata(
+                system="todoist",
+                mode=counts['mode'],
+                task_count=total,
+                stats={
+                    "new": counts['new'],
+                    "updated": counts['updated'],
+                    "unchanged": counts['unchanged'],
+                    "deleted": counts['deleted'],
+                    "total": total
+                },
+                project_id=project_id,
+                repo=project_id or ALL_PROJECTS,
+                cursor=counts['cursor']
+            )
+
+            result = {
+                "synced": total,
+                "new": counts['new'],
+                "updated": counts['updated'],
+                "unchanged": counts['unchanged'],
+                "deleted": counts['deleted'],
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "mode": counts['mode']
+            }
+
+            print(json.dumps(result, indent=2))
+            return 0
+
+        api = TodoistAPI(token, session=with_retry(requests.Session()))
+
         # Fetch tasks based on mode
         if task_id:
             # Single task mode
@@ -152,39 +368,40 @@ def sync_tasks(project_id=None, task_id=None):
 
         new_count = 0
         updated_count = 0
+        unchanged_count = 0
 
-        for task in tasks:
-            task_file = ITEMS_DIR / f"todoist-{task.id}.json"
-            is_new = not task_file.exists()
-
-            # Save normalized task
-            normalized = normalize_task(task)
-            with open(task_file, 'w') as f:
-                json.dump(normalized, f, indent=2)
-
-            if is_new:
-                new_count += 1
-            else:
-                updated_count += 1
+        with item_store.open_store() as conn:
+            for task in tasks:
+                # Save normalized task (skipped when its content hash is unchanged)
+                normalized = normalize_task(task)
+                outcome = item_store.write_item(conn, normalized)
+                if outcome == 'new':
+                    new_count += 1
+                elif outcome == 'updated':
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
 
         # Update sync metadata in unified file
         update_sync_metadata(
             system="todoist",
             mode=sync_mode,
-            task_count=new_count + updated_count,
+            task_count=new_count + updated_count + unchanged_count,
             stats={
                 "new": new_count,
                 "updated": updated_count,
-                "total": new_count + updated_count
+                "unchanged": unchanged_count,
+                "total": new_count + updated_count + unchanged_count
             },
             project_id=project_id
         )
 
         # Return stats
         result = {
-            "synced": new_count + updated_count,
+            "synced": new_count + updated_count + unchanged_count,
             "new": new_count,
             "updated": updated_count,
+            "unchanged": unchanged_count,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
@@ -199,10 +416,21 @@ def main():
     parser = argparse.ArgumentParser(description='Sync Todoist tasks to local cache')
     parser.add_argument('--project-id', help='Filter tasks by project ID')
     parser.add_argument('--task-id', help='Sync a single task by ID')
+    parser.add_argument('--full', action='store_true', help='Fetch all active tasks through the REST API instead of syncing changes')
+    parser.add_argument('--completed', action='store_true', help='Sync completed-task history since the last completed sync')
+    parser.add_argument('--days', type=int, default=DEFAULT_COMPLETED_DAYS,
+                        help=f'Days of history for the first --completed sync (default: {DEFAULT_COMPLETED_DAYS})')
 
     args = parser.parse_args()
 
-    return sync_tasks(project_id=args.project_id, task_id=args.task_id)
+    if sum(bool(x) for x in [args.task_id, args.full, args.completed]) > 1:
+        parser.error("Only one of --task-id, --full or --completed can be specified")
+
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+
+    return sync_tasks(project_id=args.project_id, task_id=args.task_id, full=args.full,
+                      completed=args.completed, days=args.days)
 
 if __name__ == '__main__':
     sys.exit(main())
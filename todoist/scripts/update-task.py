@@ -2,18 +2,35 @@
 # /// script
 # dependencies = [
 #   "todoist-api-python>=2.1.0",
+#   "requests>=2.31.0",
 # ]
 # requires-python = ">=3.9"
 # ///
 
 import argparse
+import importlib.util
 import json
 import os
 import sys
-import subprocess
 from pathlib import Path
+import requests
 from todoist_api_python.api import TodoistAPI
 
+# Add path to core scripts for item_store
+core_scripts_path = Path(__file__).parent.parent.parent / "core" / "scripts"
+sys.path.insert(0, str(core_scripts_path))
+import item_store
+from bulk_ops import DEFAULT_CONCURRENCY, parse_ids, load_operations, run_operations, summarize
+from retry import with_retry
+
+# Import the sync normalizer so cached items match what a sync writes
+_sync_path = Path(__file__).parent / "sync-tasks.py"
+_spec = importlib.util.spec_from_file_location("todoist_sync_tasks", _sync_path)
+_sync = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_sync)
+
+normalize_task = _sync.normalize_task
+
 # Valid status and priority values
 VALID_STATUSES = ["backlog", "in-progress", "done", "canceled"]
 VALID_PRIORITIES = ["low", "medium", "high"]
@@ -32,166 +49,204 @@ PRIORITY_TO_LABEL = {
     1: None
 }
 
-def update_task(task_id, status=None, priority=None, complete=False, close=False, cancel=False, content=None, description=None):
-    """Update a Todoist task's status, priority, completion state, content, or description."""
+# Fields an --ops-file line may set besides "task_id"
+UPDATE_FIELDS = ["status", "priority", "complete", "close", "cancel", "content", "description"]
+
+def get_token():
+    """Get the Todoist token from TODOIST_TOKEN, exiting if it is not set."""
     token = os.environ.get('TODOIST_TOKEN')
     if not token:
         print(json.dumps({"error": "TODOIST_TOKEN environment variable not set"}), file=sys.stderr)
         sys.exit(1)
+    return token
+
+def apply_update(api, task_id, status=None, priority=None, complete=False, close=False, cancel=False, content=None, description=None):
+    """
+    Apply one update to a Todoist task and return the refreshed task.
+
+    Content, description, priority and labels go out in one update call.
+
+    Raises:
+        ValueError: If the update is invalid
+    """
+    # Validate before touching the task
+    if not any([status, priority, complete, close, cancel, content is not None, description is not None]):
+        raise ValueError("Must specify at least one of: status, priority, complete, close, cancel, content, or description")
+    if close and cancel:
+        raise ValueError("Cannot specify both close and cancel")
+    if status and status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}")
+    if priority and priority not in VALID_PRIORITIES:
+        raise ValueError(f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}")
+
+    # Fetch current task
+    task = api.get_task(task_id)
+
+    # Handle completion states
+    if cancel:
+        status = "canceled"
+        close = True
+
+    if close and not status:
+        status = "done"
+
+    # Map status to completion
+    should_complete = False
+    if status in ["done", "canceled"] or complete:
+        should_complete = True
+
+    # Prepare update parameters
+    update_params = {}
+
+    # Update content (title) if provided
+    if content is not None:
+        update_params['content'] = content
+
+    # Update description if provided
+    if description is not None:
+        update_params['description'] = description
+
+    # Update priority if requested
+    if priority:
+        update_params['priority'] = LABEL_TO_PRIORITY.get(f"priority:{priority}", 1)
+
+    # Add status label if provided (do this BEFORE completing the task)
+    if status:
+        # Add status as a label (since Todoist doesn't have status concept)
+        task_labels = list(task.labels) if task.labels else []
+        status_label = f"status:{status}"
+        if status_label not in task_labels:
+            update_params['labels'] = task_labels + [status_label]
+
+    # Apply updates if any
+    if update_params:
+        api.update_task(task_id=task_id, **update_params)
+
+    # Handle task completion (after labels are set)
+    if should_complete and not task.is_completed:
+        api.complete_task(task_id=task_id)
+    elif not should_complete and task.is_completed:
+        api.uncomplete_task(task_id=task_id)
+
+    # Refresh task to get updated state
+    return api.get_task(task_id)
+
+def format_result(task):
+    """Build the JSON printed for an updated task."""
+    # Convert Todoist priority to label for display
+    priority_label = PRIORITY_TO_LABEL.get(task.priority)
+    display_labels = list(task.labels) if task.labels else []
+    if priority_label and priority_label not in display_labels:
+        display_labels.append(priority_label)
+
+    # Convert datetime objects to ISO format strings
+    created_at = task.created_at.isoformat() if task.created_at else None
+    updated_at = task.updated_at.isoformat() if hasattr(task, 'updated_at') and task.updated_at else created_at
+
+    # Convert due date if present
+    due_date = None
+    if task.due:
+        if hasattr(task.due, 'date'):
+            due_date = task.due.date.isoformat() if hasattr(task.due.date, 'isoformat') else str(task.due.date)
+        else:
+            due_date = str(task.due)
+
+    # Determine normalized status from labels
+    # Priority: status:canceled > status:done > status:in-progress > status:backlog > default
+    normalized_status = "open"
+    if task.is_completed:
+        # Check for status labels to determine the actual status
+        if "status:canceled" in display_labels:
+            normalized_status = "canceled"
+        elif "status:done" in display_labels:
+            normalized_status = "done"
+        else:
+            # Completed but no status label, default to done
+            normalized_status = "done"
+    else:
+        # Not completed, check for in-progress or backlog
+        if "status:in-progress" in display_labels:
+            normalized_status = "in-progress"
+        elif "status:backlog" in display_labels:
+            normalized_status = "backlog"
+
+    return {
+        "id": task.id,
+        "system": "todoist",
+        "type": "task",
+        "title": task.content,
+        "description": task.description or "",
+        "status": normalized_status,
+        "url": task.url,
+        "createdAt": created_at,
+        "updatedAt": updated_at,
+        "labels": display_labels,
+        "assignees": [],
+        "systemData": {
+            "project_id": task.project_id,
+            "priority": task.priority,
+            "due": due_date,
+            "is_completed": task.is_completed
+        }
+    }
 
+def cache_tasks(tasks):
+    """Write updated tasks straight into the cache."""
     try:
-        api = TodoistAPI(token)
-
-        # Fetch current task
-        task = api.get_task(task_id)
-
-        # Handle completion states
-        if cancel:
-            status = "canceled"
-            close = True
-
-        if close and not status:
-            status = "done"
-
-        # Map status to completion
-        should_complete = False
-        if status in ["done", "canceled"] or complete:
-            should_complete = True
+        with item_store.open_store() as conn:
+            for task in tasks:
+                item_store.write_item(conn, normalize_task(task))
+    except Exception as e:
+        # Don't fail the update if caching fails
+        print(f"Warning: Failed to update cache: {e}", file=sys.stderr)
 
-        # Prepare update parameters
-        update_params = {}
+def update_task(task_id, status=None, priority=None, complete=False, close=False, cancel=False, content=None, description=None):
+    """Update a Todoist task's status, priority, completion state, content, or description."""
+    token = get_token()
 
-        # Update content (title) if provided
-        if content is not None:
-            update_params['content'] = content
+    try:
+        api = TodoistAPI(token)
+        task = apply_update(api, task_id, status, priority, complete, close, cancel, content, description)
 
-        # Update description if provided
-        if description is not None:
-            update_params['description'] = description
+        cache_tasks([task])
 
-        # Update priority if requested
-        if priority:
-            if priority not in VALID_PRIORITIES:
-                print(json.dumps({"error": f"Invalid priority '{priority}'. Valid values: {', '.join(VALID_PRIORITIES)}"}), file=sys.stderr)
-                return 1
+        print(json.dumps(format_result(task), indent=2))
+        return 0
 
-            todoist_priority = LABEL_TO_PRIORITY.get(f"priority:{priority}", 1)
-            update_params['priority'] = todoist_priority
+    except Exception as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
 
-        # Apply updates if any
-        if update_params:
-            api.update_task(task_id=task_id, **update_params)
+def bulk_update(operations, concurrency=DEFAULT_CONCURRENCY):
+    """Apply many task updates concurrently over one client and report each one."""
+    token = get_token()
+    api = TodoistAPI(token, session=with_retry(requests.Session()))
 
-        # Add status label if provided (do this BEFORE completing the task)
-        task_labels = list(task.labels) if task.labels else []
-        labels_to_update = None
-
-        if status:
-            if status not in VALID_STATUSES:
-                print(json.dumps({"error": f"Invalid status '{status}'. Valid values: {', '.join(VALID_STATUSES)}"}), file=sys.stderr)
-                return 1
-            # Add status as a label (since Todoist doesn't have status concept)
-            status_label = f"status:{status}"
-            if status_label not in task_labels:
-                task_labels.append(status_label)
-                labels_to_update = task_labels
-
-        # Update labels in Todoist if needed
-        if labels_to_update is not None:
-            api.update_task(task_id=task_id, labels=labels_to_update)
-
-        # Handle task completion (after labels are set)
-        if should_complete and not task.is_completed:
-            api.complete_task(task_id=task_id)
-        elif not should_complete and task.is_completed:
-            api.uncomplete_task(task_id=task_id)
-
-        # Refresh task to get updated state
-        task = api.get_task(task_id)
-
-        # Convert Todoist priority to label for display
-        priority_label = PRIORITY_TO_LABEL.get(task.priority)
-        display_labels = list(task.labels) if task.labels else []
-        if priority_label and priority_label not in display_labels:
-            display_labels.append(priority_label)
-
-        # Convert datetime objects to ISO format strings
-        created_at = task.created_at.isoformat() if task.created_at else None
-        updated_at = task.updated_at.isoformat() if hasattr(task, 'updated_at') and task.updated_at else created_at
-
-        # Convert due date if present
-        due_date = None
-        if task.due:
-            if hasattr(task.due, 'date'):
-                due_date = task.due.date.isoformat() if hasattr(task.due.date, 'isoformat') else str(task.due.date)
-            else:
-                due_date = str(task.due)
-
-        # Determine normalized status from labels
-        # Priority: status:canceled > status:done > status:in-progress > status:backlog > default
-        normalized_status = "open"
-        if task.is_completed:
-            # Check for status labels to determine the actual status
-            if "status:canceled" in display_labels:
-                normalized_status = "canceled"
-            elif "status:done" in display_labels:
-                normalized_status = "done"
-            else:
-                # Completed but no status label, default to done
-                normalized_status = "done"
-        else:
-            # Not completed, check for in-progress or backlog
-            if "status:in-progress" in display_labels:
-                normalized_status = "in-progress"
-            elif "status:backlog" in display_labels:
-                normalized_status = "backlog"
-
-        # Return normalized format
-        result = {
-            "id": task.id,
-            "system": "todoist",
-            "type": "task",
-            "title": task.content,
-            "description": task.description or "",
-            "status": normalized_status,
-            "url": task.url,
-            "createdAt": created_at,
-            "updatedAt": updated_at,
-            "labels": display_labels,
-            "assignees": [],
-            "systemData": {
-                "project_id": task.project_id,
-                "priority": task.priority,
-                "due": due_date,
-                "is_completed": task.is_completed
-            }
-        }
+    updated = []
 
-        # Trigger background sync of the updated task
-        try:
-            plugin_dir = os.environ.get('PLUGIN_DIR', Path(__file__).parent.parent)
-            sync_script = Path(plugin_dir) / "scripts" / "sync-tasks.py"
-
-            subprocess.Popen(
-                [str(sync_script), "--task-id", task_id],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
-            )
-        except Exception as e:
-            # Don't fail update if sync fails
-            print(f"Warning: Failed to trigger sync: {e}", file=sys.stderr)
+    def apply(operation):
+        unknown = set(operation) - set(UPDATE_FIELDS) - {'task_id'}
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        changes = {field: operation[field] for field in UPDATE_FIELDS if field in operation}
+        task = apply_update(api, str(operation['task_id']), **changes)
+        updated.append(task)
+        return format_result(task)
 
-        print(json.dumps(result, indent=2))
-        return 0
+    reports = run_operations(operations, apply, 'task_id', concurrency)
+    cache_tasks(updated)
 
-    except Exception as e:
-        print(json.dumps({"error": str(e)}), file=sys.stderr)
-        return 1
+    summary = summarize(reports)
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["failed"] == 0 else 1
 
 def main():
     parser = argparse.ArgumentParser(description='Update a Todoist task status, priority, state, content, or description')
-    parser.add_argument('--task-id', required=True, help='Task ID to update')
+    parser.add_argument('--task-id', help='Task ID to update')
+    parser.add_argument('--task-ids', help='Comma-separated task IDs to apply the same update to')
+    parser.add_argument('--ops-file', help='JSONL file with one update per line (e.g., {"task_id": "123", "status": "done"})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'Maximum updates in flight for --task-ids/--ops-file (default: {DEFAULT_CONCURRENCY})')
     parser.add_argument('--status', choices=VALID_STATUSES, help='Set task status')
     parser.add_argument('--priority', choices=VALID_PRIORITIES, help='Set task priority')
     parser.add_argument('--complete', action='store_true', help='Mark task as completed')
@@ -202,14 +257,42 @@ def main():
 
     args = parser.parse_args()
 
-    # Validate that at least one update is requested
-    if not any([args.status, args.priority, args.complete, args.close, args.cancel, args.content, args.description]):
-        parser.error("Must specify at least one of: --status, --priority, --complete, --close, --cancel, --content, or --description")
-
     # Validate --close and --cancel are mutually exclusive
     if args.close and args.cancel:
         parser.error("Cannot specify both --close and --cancel")
 
+    has_update = any([args.status, args.priority, args.complete, args.close, args.cancel, args.content, args.description])
+
+    if args.task_ids or args.ops_file:
+        if args.task_id:
+            parser.error("--task-id cannot be combined with --task-ids or --ops-file")
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        # --ops-file lines carry their own changes; listed IDs only get the flags
+        if args.task_ids and not has_update:
+            parser.error("Must specify at least one of: --status, --priority, --complete, --close, --cancel, --content, or --description")
+
+        try:
+            operations = load_operations(
+                'task_id',
+                parse_ids(args.task_ids) if args.task_ids else None,
+                args.ops_file,
+                {'status': args.status, 'priority': args.priority, 'complete': args.complete, 'close': args.close,
+                 'cancel': args.cancel, 'content': args.content, 'description': args.description}
+            )
+        except (OSError, ValueError) as e:
+            print(json.dumps({"error": str(e)}), file=sys.stderr)
+            return 1
+
+        return bulk_update(operations, args.concurrency)
+
+    if not args.task_id:
+        parser.error("Must specify --task-id, --task-ids or --ops-file")
+
+    # Validate that at least one update is requested
+    if not has_update:
+        parser.error("Must specify at least one of: --status, --priority, --complete, --close, --cancel, --content, or --description")
+
     return update_task(args.task_id, args.status, args.priority, args.complete, args.close, args.cancel, args.content, args.description)
 
 if __name__ == '__main__':